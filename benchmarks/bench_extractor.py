@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+ARC Raiders Event Timers - Extractor Benchmark
+Compares the compiled lxml extractor and the embedded-data fast path against
+the original BeautifulSoup card scan
+
+Usage:
+    python3 benchmarks/bench_extractor.py [page.html ...]
+
+Pages may also be debug captures (.json.gz, see core/debug_capture.py);
+with no arguments the bundled fixtures and the newest captured HTML page
+are used. Peak memory comes from tracemalloc, which sees Python objects
+(the whole BeautifulSoup tree) but not libxml2's own C allocations, so the
+lxml figure understates its tree by roughly the size of the page.
+"""
+
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'core'))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from debug_capture import CAPTURE_SUFFIX, list_captures, load_capture  # noqa: E402
+from event_extractor import extract_embedded_events, extract_events, parse_countdown  # noqa: E402
+from event_model import EventTimer  # noqa: E402
+
+FIXTURE_PAGES = [
+    os.path.join(BENCH_DIR, 'fixtures', 'event-timers.html'),
+    os.path.join(BENCH_DIR, 'fixtures', 'event-timers-embedded.html'),
+]
+
+
+def convert_range(time_range):
+    """Stand-in for the GUI's timezone conversion (identity, same call count)"""
+    return time_range
+
+
+def legacy_extract_events(html_content, convert_range=None):
+    """The lambda-filtered BeautifulSoup scan that fetch_events used to run"""
+    soup = BeautifulSoup(html_content, 'lxml')
+    events = []
+    event_cards = soup.find_all('div', class_=lambda x: x and 'bg-secondary/70' in x)
+    for card in event_cards:
+        name_elem = card.find('h4', class_=lambda x: x and 'text-foreground' in x and 'font-semibold' in x)
+        if not name_elem:
+            continue
+        event_name = name_elem.get_text(strip=True)
+
+        status = "Upcoming"
+        status_badge = card.find('span', class_=lambda x: x and ('text-green-400' in x or 'text-blue-400' in x))
+        if status_badge and 'Active' in status_badge.get_text(strip=True):
+            status = "Active"
+
+        locations = []
+        location_elem = card.find('div', class_=lambda x: x and 'text-muted-foreground' in x and 'text-xs' in x and 'uppercase' in x)
+        if location_elem:
+            location_text = location_elem.get_text(strip=True)
+            for loc in ["Dam", "Spaceport", "Buried City", "Blue Gate"]:
+                if loc in location_text:
+                    locations.append(loc)
+
+        countdown_seconds = 0
+        countdown_elem = card.find('span', class_=lambda x: x and 'text-lg' in x and 'font-semibold' in x and 'text-white' in x)
+        if countdown_elem:
+            countdown_seconds = parse_countdown(countdown_elem.get_text(strip=True))
+
+        time_info = ""
+        time_elem = card.find('div', class_=lambda x: x and 'text-foreground/90' in x and 'text-sm' in x and 'font-medium' in x)
+        if time_elem:
+            time_info = convert_range(time_elem.get_text(strip=True))
+
+        upcoming_windows = []
+        windows_container = card.find('div', class_=lambda x: x and 'divide-border' in x)
+        if windows_container:
+            window_divs = windows_container.find_all('div', class_=lambda x: x and 'py-1.5' in x)
+            for window_div in window_divs[:5]:
+                window_text = window_div.get_text(separator=' ', strip=True)
+                match = re.search(r'(\d{1,2}:\d{2}\s*[AP]M)\s*-\s*(\d{1,2}:\d{2}\s*[AP]M)', window_text)
+                if match:
+                    utc_range = f"{match.group(1)} - {match.group(2)}"
+                    window_text = window_text.replace(utc_range, convert_range(utc_range))
+                upcoming_windows.append(window_text)
+
+        if event_name and (countdown_seconds > 0 or locations):
+            events.append(EventTimer(
+                name=event_name,
+                status=status,
+                locations=locations if locations else ["Multiple Locations"],
+                time_info=time_info,
+                countdown_seconds=countdown_seconds,
+                upcoming_windows=upcoming_windows
+            ))
+    return events
+
+
+# Capture time of the bundled fixtures (2026-10-17 05:30 UTC); the embedded
+# schedule carries absolute timestamps, so it is evaluated at this instant
+FIXTURE_NOW = 1792215000
+
+
+def read_page(path):
+    """Return (html, capture time) for a saved page or a debug capture"""
+    if path.endswith(CAPTURE_SUFFIX):
+        record = load_capture(path)
+        return record['body'], record['captured_at']
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read(), FIXTURE_NOW
+
+
+def default_pages():
+    html_captures = [p for p in list_captures() if load_capture(p)['content_type'].startswith('text/html')]
+    return FIXTURE_PAGES + html_captures[-1:]
+
+
+def event_key(event):
+    return (event.name, event.status, tuple(event.locations), event.time_info,
+            event.countdown_seconds, tuple(event.upcoming_windows))
+
+
+def measure(func, html_content, repeat):
+    """Return (best seconds, peak traced bytes, events) for func(html_content)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        events = func(html_content, convert_range)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(html_content, convert_range)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, events
+
+
+def bench_page(path, repeat=20):
+    html_content, captured_at = read_page(path)
+
+    def embedded_extract_events(html_content, convert_range=None):
+        return extract_embedded_events(html_content, convert_range, now=captured_at)
+
+    legacy_time, legacy_peak, legacy_events = measure(legacy_extract_events, html_content, repeat)
+    new_time, new_peak, new_events = measure(extract_events, html_content, repeat)
+
+    same = [event_key(e) for e in legacy_events] == [event_key(e) for e in new_events]
+
+    embedded_time, embedded_peak, embedded_events = measure(embedded_extract_events, html_content, repeat)
+
+    print(f"{os.path.basename(path) if path.endswith(CAPTURE_SUFFIX) else os.path.relpath(path, PROJECT_ROOT)} ({len(html_content) / 1024:.0f} KiB, {len(new_events)} events)")
+    print(f"  {'':13} {'best time':>12} {'peak memory':>14}")
+    print(f"  {'BeautifulSoup':13} {legacy_time * 1000:>10.2f}ms {legacy_peak / 1024:>11.0f}KiB")
+    print(f"  {'lxml XPath':13} {new_time * 1000:>10.2f}ms {new_peak / 1024:>11.0f}KiB")
+    if embedded_events:
+        print(f"  {'embedded JSON':13} {embedded_time * 1000:>10.2f}ms {embedded_peak / 1024:>11.0f}KiB"
+              f"  ({len(embedded_events)} events)")
+    print(f"  speedup {legacy_time / new_time:.1f}x, memory {legacy_peak / max(new_peak, 1):.1f}x smaller, "
+          f"results {'identical' if same else 'DIFFER'}")
+    return same
+
+
+def main():
+    pages = sys.argv[1:] or default_pages()
+    all_same = True
+    for path in pages:
+        all_same = bench_page(path) and all_same
+    return 0 if all_same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
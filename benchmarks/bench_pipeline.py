@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+ARC Raiders Event Timers - Pipeline Benchmark
+Times each stage of fetch -> parse -> render -> tick offline and compares the
+results with a stored baseline
+
+Usage:
+    python3 benchmarks/bench_pipeline.py                  # run and compare with the baseline
+    python3 benchmarks/bench_pipeline.py --save-baseline  # run and store the results as the baseline
+    python3 benchmarks/bench_pipeline.py --check          # exit 1 if any stage regressed
+    python3 benchmarks/bench_pipeline.py --stages parse-json,tick-500
+
+Stages:
+    parse-*         EventService parsing of the recorded pages / API JSON in
+                    benchmarks/fixtures/ (and of the newest debug capture, see
+                    debug_capture.py), exactly as fetch_events runs it once
+                    the body has arrived
+    stream-*        the same pages through EventService.parse_html_stream, fed
+                    in download-sized chunks
+    convert-range   EventService.convert_time_range_to_local on one range
+    render-N        display_events building N cards from an empty grid
+    rerender-N      display_events with N cards already on screen
+    tick-N          one update_countdowns pass with every label changing
+
+Each stage runs in its own interpreter so peak RSS is not polluted by the
+others. Time is the median of --repeat runs; allocations are the tracemalloc
+peak of one run (Python objects only); RSS growth is the stage's increase of
+the process high-water mark over its setup. The Tk stages need a display and
+are skipped without one.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCH_DIR)
+FIXTURE_DIR = os.path.join(BENCH_DIR, 'fixtures')
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'core'))
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'pipeline-baseline.json')
+
+# Capture time of the bundled fixtures (2026-10-17 05:30 UTC), as in bench_extractor
+FIXTURE_NOW = 1792215000
+
+PAGES = {
+    'parse-html': os.path.join(FIXTURE_DIR, 'event-timers.html'),
+    'parse-embedded': os.path.join(FIXTURE_DIR, 'event-timers-embedded.html'),
+}
+API_FIXTURE = os.path.join(FIXTURE_DIR, 'event-timers.json')
+CARD_COUNTS = (9, 50, 500)
+
+# Newest debug capture, resolved by the parent process (children get a scratch cache dir)
+CAPTURE_PATH = None
+
+# A stage regresses when it is this much slower than the baseline...
+REGRESSION_RATIO = 1.25
+# ...and the difference is big enough not to be timer noise
+REGRESSION_FLOOR_MS = 0.05
+
+
+class StageSkipped(Exception):
+    pass
+
+
+class RecordedResponse:
+    """The parts of a requests.Response the parsers use"""
+
+    def __init__(self, text):
+        self.text = text
+        self.encoding = 'utf-8'
+
+    def json(self):
+        return json.loads(self.text)
+
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        for start in range(0, len(self.text), chunk_size):
+            yield self.text[start:start + chunk_size]
+
+
+def make_service():
+    import event_service
+    # Never fill the user's capture store from a benchmark
+    event_service.DEBUG_MODE = False
+    return event_service.EventService()
+
+
+def make_events(count):
+    """Synthetic events shaped like the real ones, with distinct countdowns"""
+    from event_model import EventTimer
+
+    locations = ["Dam", "Spaceport", "Buried City", "Blue Gate"]
+    events = []
+    for i in range(count):
+        hour = i % 12 + 1
+        events.append(EventTimer(
+            name=f"Event {i}",
+            status="Active" if i % 3 == 0 else "Upcoming",
+            locations=[locations[i % 4], locations[(i + 1) % 4]],
+            time_info=f"{hour}:00 AM - {hour}:30 AM",
+            countdown_seconds=600 + i * 7,
+            upcoming_windows=[f"{(hour + k) % 12 + 1}:00 PM - {(hour + k) % 12 + 1}:30 PM "
+                              f"{locations[k % 4]} in {k + 1}h {i % 60}m" for k in range(5)],
+        ))
+    return events
+
+
+def make_gui():
+    """An ArcTimersGUI on a withdrawn root that never touches the network"""
+    import tkinter as tk
+    import arc_timers
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        raise StageSkipped(str(e))
+    root.withdraw()
+    arc_timers.ArcTimersGUI.start_service = lambda self: None
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        gui = arc_timers.ArcTimersGUI(root)
+    return gui
+
+
+# Each stage factory does its setup and returns (prepare, run): prepare is
+# called untimed before every run of run().
+
+def stage_parse_page(path):
+    if not os.path.exists(path):
+        raise StageSkipped(f"{os.path.relpath(path, PROJECT_ROOT)} not found")
+    with open(path, 'r', encoding='utf-8') as f:
+        response = RecordedResponse(f.read())
+    service = make_service()
+    return None, lambda: service.parse_html_response(response, now=FIXTURE_NOW)
+
+
+def stage_stream_page(path):
+    if not os.path.exists(path):
+        raise StageSkipped(f"{os.path.relpath(path, PROJECT_ROOT)} not found")
+    with open(path, 'r', encoding='utf-8') as f:
+        response = RecordedResponse(f.read())
+    service = make_service()
+    return None, lambda: service.parse_html_stream(response, now=FIXTURE_NOW)
+
+
+def stage_parse_capture(path):
+    if not path:
+        raise StageSkipped("no debug captures (enable capture with Ctrl+D or --capture)")
+    from debug_capture import load_capture
+    record = load_capture(path)
+    service = make_service()
+    return None, lambda: service.replay_capture(record)
+
+
+def stage_parse_json():
+    with open(API_FIXTURE, 'r', encoding='utf-8') as f:
+        response = RecordedResponse(f.read())
+    service = make_service()
+    return None, lambda: service.parse_api_data(response.json(), now=FIXTURE_NOW)
+
+
+def stage_convert_range():
+    service = make_service()
+    return None, lambda: service.convert_time_range_to_local("5:00 AM - 6:00 AM")
+
+
+def stage_render(count):
+    gui = make_gui()
+    events = make_events(count)
+
+    def prepare():
+        gui.events = []
+        gui.display_events()
+        gui.root.update_idletasks()
+
+    def run():
+        gui.events = events
+        gui.display_events()
+        gui.root.update_idletasks()
+    return prepare, run
+
+
+def stage_rerender(count):
+    gui = make_gui()
+    gui.events = make_events(count)
+    gui.display_events()
+    gui.root.update_idletasks()
+
+    def run():
+        gui.display_events()
+        gui.root.update_idletasks()
+    return None, run
+
+
+def stage_tick(count):
+    gui = make_gui()
+    gui.events = make_events(count)
+    gui.display_events()
+
+    def prepare():
+        # Every countdown drops by a second, so every label has to change
+        for event in gui.events:
+            event.deadline -= 1
+
+    def run():
+        gui.update_countdowns()
+        gui.root.after_cancel(gui.countdown_job)
+        gui.root.update_idletasks()
+    return prepare, run
+
+
+def stage_factories():
+    factories = {}
+    for name, path in PAGES.items():
+        factories[name] = lambda path=path: stage_parse_page(path)
+        factories[name.replace('parse-', 'stream-')] = lambda path=path: stage_stream_page(path)
+    factories['parse-capture'] = lambda: stage_parse_capture(CAPTURE_PATH)
+    factories['parse-json'] = stage_parse_json
+    factories['convert-range'] = stage_convert_range
+    for count in CARD_COUNTS:
+        factories[f'render-{count}'] = lambda count=count: stage_render(count)
+        factories[f'rerender-{count}'] = lambda count=count: stage_rerender(count)
+        factories[f'tick-{count}'] = lambda count=count: stage_tick(count)
+    return factories
+
+
+def max_rss_kib():
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_stage(name, repeat):
+    """Run one stage in this process and return its measurements"""
+    prepare, run = stage_factories()[name]()
+    quiet = open(os.devnull, 'w')
+    rss_before = max_rss_kib()
+
+    times = []
+    with contextlib.redirect_stdout(quiet):
+        for _ in range(repeat):
+            if prepare:
+                prepare()
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+
+        if prepare:
+            prepare()
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    rss_after = max_rss_kib()
+    return {
+        'time_ms': statistics.median(times) * 1000,
+        'alloc_kib': peak / 1024,
+        'rss_growth_kib': rss_after - rss_before,
+        'max_rss_kib': rss_after,
+    }
+
+
+def run_stage_isolated(name, repeat, cache_dir, capture_path=None):
+    """Run one stage in a fresh interpreter; returns (result, skip reason)"""
+    env = dict(os.environ)
+    env['XDG_CACHE_HOME'] = cache_dir
+    command = [sys.executable, os.path.abspath(__file__), '--run-stage', name, '--repeat', str(repeat)]
+    if capture_path:
+        command += ['--capture', capture_path]
+    result = subprocess.run(command, env=env, capture_output=True, text=True)
+    lines = result.stdout.strip().splitlines()
+    if result.returncode != 0 or not lines:
+        error = result.stderr.strip().splitlines()
+        return None, error[-1] if error else f"exit code {result.returncode}"
+    payload = json.loads(lines[-1])
+    return payload.get('result'), payload.get('skipped')
+
+
+def load_baseline(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('stages', {})
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path, results):
+    payload = {
+        'python': sys.version.split()[0],
+        'saved_at': time.time(),
+        'stages': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare(result, base):
+    """Return (change text, regressed) against a baseline entry"""
+    if not base:
+        return "", False
+    delta = result['time_ms'] - base['time_ms']
+    ratio = result['time_ms'] / base['time_ms'] if base['time_ms'] else 1.0
+    regressed = ratio > REGRESSION_RATIO and delta > REGRESSION_FLOOR_MS
+    text = f"{(ratio - 1) * 100:+.0f}%"
+    return (text + " REGRESSION" if regressed else text), regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the fetch -> parse -> render -> tick pipeline")
+    parser.add_argument('--stages', help="comma-separated stage names (default: all)")
+    parser.add_argument('--repeat', type=int, default=20, help="timed runs per stage")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument('--save-baseline', action='store_true', help="store these results as the baseline")
+    parser.add_argument('--check', action='store_true', help="exit 1 if any stage regressed")
+    parser.add_argument('--capture', help="debug capture for parse-capture (default: the newest one)")
+    parser.add_argument('--run-stage', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    global CAPTURE_PATH
+    CAPTURE_PATH = args.capture
+    if args.run_stage:
+        try:
+            payload = {'result': run_stage(args.run_stage, args.repeat)}
+        except StageSkipped as e:
+            payload = {'skipped': str(e)}
+        print(json.dumps(payload))
+        return 0
+
+    names = list(stage_factories())
+    if args.stages:
+        names = [name.strip() for name in args.stages.split(',') if name.strip()]
+        unknown = [name for name in names if name not in stage_factories()]
+        if unknown:
+            parser.error(f"unknown stages: {', '.join(unknown)}")
+
+    if CAPTURE_PATH is None:
+        from debug_capture import list_captures
+        captures = list_captures()
+        CAPTURE_PATH = captures[-1] if captures else None
+
+    baseline = load_baseline(args.baseline)
+    results = {}
+    regressions = []
+    print(f"{'stage':15} {'time':>10} {'alloc peak':>11} {'RSS growth':>11} {'max RSS':>9}  vs baseline")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for name in names:
+            result, skipped = run_stage_isolated(name, args.repeat, cache_dir, CAPTURE_PATH)
+            if result is None:
+                print(f"{name:15} skipped ({skipped})")
+                continue
+            results[name] = result
+            change, regressed = compare(result, baseline.get(name))
+            if regressed:
+                regressions.append(name)
+            print(f"{name:15} {result['time_ms']:>8.3f}ms {result['alloc_kib']:>8.0f}KiB "
+                  f"{result['rss_growth_kib']:>8.0f}KiB {result['max_rss_kib'] / 1024:>6.0f}MiB  {change}")
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Baseline saved to {os.path.relpath(args.baseline, PROJECT_ROOT)}")
+    elif not baseline:
+        print("No baseline yet; run with --save-baseline to store one")
+    if regressions:
+        print(f"Regressed: {', '.join(regressions)}")
+        if args.check:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
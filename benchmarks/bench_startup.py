@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+ARC Raiders Event Timers - Startup Benchmark
+Measures module import time and time-to-first-window for the GUI, and import
+time for the headless CLI
+
+Usage:
+    python3 benchmarks/bench_startup.py [--runs N]
+
+Every measurement runs in a fresh interpreter with an empty cache directory.
+Import time is the wall time of ``python -c "import module"`` minus that of
+``python -c pass``; the heaviest imports come from ``-X importtime``.
+Time-to-first-window is measured from process start to the main window's
+first <Map> event and needs a display (it is skipped without one). It also
+reports which heavy modules were already loaded when the window appeared:
+ideally only tkinter.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCH_DIR)
+CORE_DIR = os.path.join(PROJECT_ROOT, 'core')
+
+HEAVY_MODULES = ('tkinter', 'PIL', 'requests', 'lxml', 'bs4')
+
+FIRST_WINDOW_SCRIPT = f"""
+import os, sys
+sys.path.insert(0, {CORE_DIR!r})
+import tkinter as tk
+import arc_timers
+
+root = tk.Tk()
+
+def mapped(event):
+    if event.widget is root:
+        loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]
+        print("mapped " + ",".join(loaded), flush=True)
+        os._exit(0)
+
+root.bind("<Map>", mapped)
+arc_timers.ArcTimersGUI(root)
+root.mainloop()
+"""
+
+
+def child_env(cache_dir):
+    env = dict(os.environ)
+    env['XDG_CACHE_HOME'] = cache_dir
+    env['PYTHONPATH'] = CORE_DIR
+    env.pop('PYTHONSTARTUP', None)
+    return env
+
+
+def timed_run(args, env, timeout=60):
+    """Return (seconds, completed process) for one fresh interpreter"""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable] + args, env=env, capture_output=True,
+                            text=True, timeout=timeout)
+    return time.perf_counter() - start, result
+
+
+def import_time(module, env, runs):
+    """Median seconds spent importing module, over an empty interpreter"""
+    empty = [timed_run(['-c', 'pass'], env)[0] for _ in range(runs)]
+    full = []
+    for _ in range(runs):
+        elapsed, result = timed_run(['-c', f'import {module}'], env)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        full.append(elapsed)
+    return max(0.0, statistics.median(full) - statistics.median(empty))
+
+
+def heaviest_imports(module, env, count=6):
+    """Direct imports of module, heaviest first, as (cumulative seconds, name)"""
+    _, result = timed_run(['-X', 'importtime', '-c', f'import {module}'], env)
+    entries = []
+    seen_site = False
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or line.count('|') != 2:
+            continue
+        _, cumulative, name = line.split('|')
+        if name.strip() == 'site' and not seen_site:
+            # Everything before this is interpreter startup
+            seen_site = True
+            entries = []
+            continue
+        if not cumulative.strip().isdigit():
+            continue
+        # -X importtime indents two spaces per level; module itself is at one
+        if name.startswith('   ') and not name.startswith('    '):
+            entries.append((int(cumulative) / 1e6, name.strip()))
+    return sorted(entries, reverse=True)[:count]
+
+
+def first_window(env, runs):
+    """(median seconds, heavy modules loaded) to the first <Map>, or (None, error)"""
+    times = []
+    loaded = ""
+    for _ in range(runs):
+        try:
+            elapsed, result = timed_run(['-c', FIRST_WINDOW_SCRIPT], env, timeout=30)
+        except subprocess.TimeoutExpired:
+            return None, "timed out waiting for the window"
+        output = result.stdout.strip()
+        if not output.startswith('mapped'):
+            error = result.stderr.strip().splitlines()
+            return None, error[-1] if error else f"exit code {result.returncode}"
+        times.append(elapsed)
+        loaded = output[len('mapped'):].strip()
+    return statistics.median(times), loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time and time-to-first-window")
+    parser.add_argument('--runs', type=int, default=5, help="fresh interpreters per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = child_env(cache_dir)
+
+        for module, label in (('arc_timers', 'GUI module'), ('arc_timers_cli', 'CLI module')):
+            try:
+                seconds = import_time(module, env, args.runs)
+            except RuntimeError as e:
+                print(f"{label} ({module}): import failed: {e}")
+                continue
+            print(f"{label} ({module}): {seconds * 1000:.1f}ms to import")
+            for cumulative, name in heaviest_imports(module, env):
+                print(f"  {cumulative * 1000:>8.1f}ms  {name}")
+
+        seconds, detail = first_window(env, args.runs)
+        if seconds is None:
+            print(f"Time to first window: skipped ({detail})")
+            return 0
+        print(f"Time to first window: {seconds * 1000:.1f}ms (process start to <Map>)")
+        print(f"  loaded at first window: {detail or 'none of ' + ', '.join(HEAVY_MODULES)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
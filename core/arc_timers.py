@@ -5,29 +5,29 @@ Fetches and displays event timers from MetaForge
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox
-import requests
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta, timezone
-import re
-import threading
-import time
-import json
+from tkinter import ttk
+from datetime import datetime
+import queue
+import math
 import os
-from PIL import Image, ImageTk
-
-# Debug mode - set to True to save HTML/JSON responses
-DEBUG_MODE = True
-
+import time
+# Only what the first frame needs is imported up front; PIL and the network /
+# parsing stack (requests, lxml via event_service) load once the window is up
+from asset_cache import scaled_assets
+from event_model import (EventStatus, event_fingerprint, format_countdown, monotonic_now, parse_countdown,
+                         schedule_fingerprint)
+from metrics import metrics
+from refresh_scheduler import RefreshScheduler
+from snapshot_cache import load_snapshot
 
-class EventTimer:
-    def __init__(self, name, status, locations, time_info, countdown_seconds, upcoming_windows):
-        self.name = name
-        self.status = status  # "Active" or "Upcoming"
-        self.locations = locations
-        self.time_info = time_info  # e.g., "1:00 AM - 2:00 AM"
-        self.countdown_seconds = countdown_seconds
-        self.upcoming_windows = upcoming_windows  # List of upcoming time windows
+# Logo lives in the project root; pre-scaled renders are cached by asset_cache
+LOGO_SOURCE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'timers250.png')
+ICON_SIZES = (64, 32)
+LOGO_SIZE = 45
+# How often the result queue is checked while a refresh is running (ms)
+POLL_INTERVAL = 50
+# How often the stats panel (Ctrl+M) is redrawn while open (ms)
+STATS_INTERVAL = 1000
 
 
 class ArcTimersGUI:
@@ -38,29 +38,65 @@ class ArcTimersGUI:
         self.root.minsize(1200, 700)  # Set minimum window size
         self.root.configure(bg="#1a1a1a")
         
-        # Set window icon (look in parent directory)
+        # Set window icon from the pre-scaled renders (full-size logo if they are missing)
+        self.logo_assets = {}
         try:
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            parent_dir = os.path.dirname(script_dir)
-            icon_path = os.path.join(parent_dir, 'timers250.png')
-            if os.path.exists(icon_path):
-                icon_image = tk.PhotoImage(file=icon_path)
-                self.root.iconphoto(True, icon_image)
+            if os.path.exists(LOGO_SOURCE):
+                self.logo_assets = scaled_assets(LOGO_SOURCE, ICON_SIZES + (LOGO_SIZE,))
+                icon_images = [tk.PhotoImage(file=self.logo_assets[size])
+                               for size in ICON_SIZES if size in self.logo_assets]
+                if not icon_images:
+                    icon_images = [tk.PhotoImage(file=LOGO_SOURCE)]
+                self.root.iconphoto(True, *icon_images)
         except Exception as e:
             print(f"Could not load icon: {e}")
         
         self.events = []
         self.update_thread = None
         self.running = True
-        self.refresh_triggered = False  # Prevent multiple refreshes
-        self.last_refresh_time = 0
-        
-        # Get user's local timezone
-        self.local_tz = self.get_local_timezone()
-        print(f"User timezone: {self.local_tz}")
+        self.refresh_job = None  # Pending auto_refresh callback
+        self.refresh_scheduler = RefreshScheduler()
+        self.countdown_job = None  # Pending update_countdowns callback
+        # event -> [countdown label, last rendered text], filled by create_event_card
+        self.countdown_registry = {}
+        self.cards = {}  # card_key -> card record, see create_event_card
+        # schedule_fingerprint() of the events the cards show, None when they
+        # show something else (streamed partial results, the error panel)
+        self.shown_fingerprint = None
+        self.grid_rows = 0
+        self.error_frame = None
+        # Generation of the last fetch snapshot shown (see EventService.request_refresh);
+        # anything older that arrives later is dropped
+        self.generation = 0
+        # Events streamed in so far by the refresh in flight, by name
+        self.streamed_events = None
+        self.poll_job = None  # Pending poll_results callback
+        self.stats_window = None  # Ctrl+M panel, see toggle_stats_panel
+        self.stats_job = None
+        
+        # Fetching, parsing and timezone handling live outside the GUI;
+        # created by start_service() once the window has been drawn
+        self.service = None
         
         self.setup_ui()
-        self.fetch_and_display_events()
+        self.show_cached_snapshot()
+        self.root.after_idle(self.start_service)
+    
+    def start_service(self):
+        """Import the network and parsing stack and run the first fetch"""
+        from event_service import EventService
+        self.service = EventService()
+        self.fetch_and_display_events("startup")
+    
+    def show_cached_snapshot(self):
+        """Render the last saved events immediately while the network fetch runs"""
+        events, saved_at = load_snapshot()
+        if not events:
+            return
+        self.events = events
+        self.display_events()
+        saved_text = datetime.fromtimestamp(saved_at).strftime('%I:%M:%S %p')
+        print(f"Showing {len(events)} cached events from {saved_text}")
         
     def setup_ui(self):
         # Header - more compact to give grid more space
@@ -72,17 +108,16 @@ class ArcTimersGUI:
         title_container = tk.Frame(header_frame, bg="#2d2d2d")
         title_container.pack(side=tk.LEFT, padx=16, pady=10)
         
-        # Load and display logo (look in parent directory)
+        # Load and display logo (pre-scaled to fit the header)
+        self.logo_photo = None
         try:
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            parent_dir = os.path.dirname(script_dir)
-            logo_path = os.path.join(parent_dir, 'timers250.png')
-            if os.path.exists(logo_path):
-                logo_image = Image.open(logo_path)
-                # Resize logo to fit header (maintain aspect ratio)
-                logo_image = logo_image.resize((45, 45), Image.Resampling.LANCZOS)
-                self.logo_photo = ImageTk.PhotoImage(logo_image)
-                
+            if LOGO_SIZE in self.logo_assets:
+                self.logo_photo = tk.PhotoImage(file=self.logo_assets[LOGO_SIZE])
+            elif os.path.exists(LOGO_SOURCE):
+                # No cached render (e.g. Pillow missing): let Tk shrink it by an integer factor
+                full_logo = tk.PhotoImage(file=LOGO_SOURCE)
+                self.logo_photo = full_logo.subsample(max(1, -(-full_logo.width() // LOGO_SIZE)))
+            if self.logo_photo is not None:
                 logo_label = tk.Label(
                     title_container,
                     image=self.logo_photo,
@@ -93,7 +128,7 @@ class ArcTimersGUI:
             print(f"Could not load logo: {e}")
         
         # Title with timezone info
-        tz_name = datetime.now().astimezone().tzname() if self.local_tz else "Local"
+        tz_name = datetime.now().astimezone().tzname() or "Local"
         title_label = tk.Label(
             title_container,
             text=f"ARC Raiders Event Timers ({tz_name})",
@@ -106,14 +141,15 @@ class ArcTimersGUI:
         self.refresh_btn = tk.Button(
             header_frame,
             text="⟳ Refresh",
-            command=self.fetch_and_display_events,
+            command=lambda: self.fetch_and_display_events("manual"),
             bg="#4a9eff",
             fg="#ffffff",
             font=("Arial", 10, "bold"),
             padx=16,
             pady=5,
             relief=tk.FLAT,
-            cursor="hand2"
+            cursor="hand2",
+            state=tk.DISABLED  # Enabled once the first fetch finishes
         )
         self.refresh_btn.pack(side=tk.RIGHT, padx=16, pady=10)
         
@@ -153,439 +189,383 @@ class ArcTimersGUI:
         # Bind mouse wheel
         canvas.bind_all("<MouseWheel>", lambda e: canvas.yview_scroll(int(-1*(e.delta/120)), "units"))
         
-    def parse_countdown(self, countdown_text):
-        """Parse countdown text like '3h 42m 26s' or '42m 26s' to seconds"""
-        if not countdown_text:
-            return 0
-            
-        hours = 0
-        minutes = 0
-        seconds = 0
-        
-        h_match = re.search(r'(\d+)h', countdown_text.lower())
-        m_match = re.search(r'(\d+)m', countdown_text.lower())
-        s_match = re.search(r'(\d+)s', countdown_text.lower())
-        
-        if h_match:
-            hours = int(h_match.group(1))
-        if m_match:
-            minutes = int(m_match.group(1))
-        if s_match:
-            seconds = int(s_match.group(1))
-            
-        return hours * 3600 + minutes * 60 + seconds
+        # Ctrl+D switches debug capture of fetched responses on and off
+        self.root.bind("<Control-d>", self.toggle_debug_capture)
+        # Ctrl+M shows timings and counters (see metrics.py)
+        self.root.bind("<Control-m>", self.toggle_stats_panel)
+        
+    def toggle_debug_capture(self, event=None):
+        """Turn capture of raw responses (see debug_capture.py) on or off"""
+        if self.service is None:
+            return
+        capture = self.service.capture
+        capture.enabled = not capture.enabled
+        if capture.enabled:
+            status_text = f"Debug capture on: {capture.directory}"
+        else:
+            status_text = "Debug capture off"
+        print(status_text)
+        self.status_label.config(text=status_text)
     
-    def get_local_timezone(self):
-        """Get the user's local timezone"""
-        try:
-            # Try to get local timezone
-            local_tz_name = datetime.now(timezone.utc).astimezone().tzname()
-            # Get the timezone object
-            return datetime.now().astimezone().tzinfo
-        except Exception as e:
-            print(f"Could not detect timezone: {e}, using system local time")
-            return None
+    def toggle_stats_panel(self, event=None):
+        """Open or close a small window with the recorded timings and counters"""
+        if self.stats_window is not None:
+            self.close_stats_panel()
+            return
+        window = tk.Toplevel(self.root)
+        window.title("ARC Raiders Timers - Stats")
+        window.configure(bg="#1a1a1a")
+        window.protocol("WM_DELETE_WINDOW", self.close_stats_panel)
+        self.stats_label = tk.Label(
+            window,
+            font=("Courier", 9),
+            bg="#1a1a1a",
+            fg="#cccccc",
+            anchor="nw",
+            justify=tk.LEFT
+        )
+        self.stats_label.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.stats_window = window
+        self.update_stats_panel()
     
-    def convert_utc_time_to_local(self, time_str):
-        """Convert UTC time string like '5:00 AM' to local timezone"""
-        try:
-            # Parse the UTC time
-            utc_time = datetime.strptime(time_str.strip(), "%I:%M %p")
-            
-            # Get current date in UTC
-            now_utc = datetime.now(timezone.utc)
-            
-            # Combine with today's date in UTC
-            utc_datetime = datetime(
-                now_utc.year, now_utc.month, now_utc.day,
-                utc_time.hour, utc_time.minute,
-                tzinfo=timezone.utc
-            )
-            
-            # Convert to local timezone
-            if self.local_tz:
-                local_datetime = utc_datetime.astimezone(self.local_tz)
-            else:
-                local_datetime = utc_datetime.astimezone()
-            
-            # Return formatted local time
-            return local_datetime.strftime("%I:%M %p")
-        except Exception as e:
-            print(f"Error converting time {time_str}: {e}")
-            return time_str
+    def update_stats_panel(self):
+        """Redraw the stats panel while it is open"""
+        self.stats_job = None
+        if self.stats_window is None or not self.running:
+            return
+        self.stats_label.config(text=metrics.summary())
+        self.stats_job = self.root.after(STATS_INTERVAL, self.update_stats_panel)
     
-    def convert_time_range_to_local(self, time_range):
-        """Convert UTC time range like '5:00 AM - 6:00 AM' to local timezone"""
-        try:
-            if not time_range or '-' not in time_range:
-                return time_range
-            
-            parts = time_range.split('-')
-            if len(parts) != 2:
-                return time_range
-            
-            start_time = self.convert_utc_time_to_local(parts[0])
-            end_time = self.convert_utc_time_to_local(parts[1])
-            
-            return f"{start_time} - {end_time}"
-        except Exception as e:
-            print(f"Error converting time range {time_range}: {e}")
-            return time_range
+    def close_stats_panel(self):
+        if self.stats_job is not None:
+            self.root.after_cancel(self.stats_job)
+            self.stats_job = None
+        if self.stats_window is not None:
+            self.stats_window.destroy()
+            self.stats_window = None
+    
+    def parse_countdown(self, countdown_text):
+        """Parse countdown text like '3h 42m 26s' or '42m 26s' to seconds"""
+        return parse_countdown(countdown_text)
     
     def format_countdown(self, seconds):
         """Format seconds to '3h 42m 26s' format"""
-        if seconds <= 0:
-            return "0s"
-            
-        hours = seconds // 3600
-        minutes = (seconds % 3600) // 60
-        secs = seconds % 60
-        
-        parts = []
-        if hours > 0:
-            parts.append(f"{hours}h")
-        if minutes > 0:
-            parts.append(f"{minutes}m")
-        if secs > 0 or not parts:
-            parts.append(f"{secs}s")
-            
-        return " ".join(parts)
+        return format_countdown(seconds)
+    
+    def fetch_and_display_events(self, reason="manual"):
+        """Start a background refresh; poll_results() displays what it delivers"""
+        metrics.incr("refreshes", reason=reason)
+        self.status_label.config(text="Refreshing..." if self.events else "Loading...")
+        self.refresh_btn.config(state=tk.DISABLED)
+        
+        # The user asking for it overrides any backoff from failed sources
+        self.service.request_refresh(force=reason == "manual")
+        # Cards are shown as the page streams in; the full result replaces them
+        self.streamed_events = {}
+        if self.poll_job is None:
+            self.poll_results()
     
-    def fetch_events_from_api(self):
-        """Try to fetch events from MetaForge API"""
+    def poll_results(self):
+        """Drain the service's result queue on the Tk thread while a refresh is running"""
+        self.poll_job = None
+        if not self.running:
+            return
+        streamed = False
         try:
-            # Try potential API endpoints
-            api_urls = [
-                "https://metaforge.app/api/arc-raiders/event-timers",
-                "https://metaforge.app/api/events/arc-raiders",
-                "https://api.metaforge.app/arc-raiders/event-timers",
-            ]
-            
-            headers = {
-                'User-Agent': 'ArcTimersApp/1.0',
-                'Accept': 'application/json',
-            }
-            
-            for api_url in api_urls:
-                try:
-                    response = requests.get(api_url, headers=headers, timeout=10)
-                    if response.status_code == 200:
-                        data = response.json()
-                        print(f"Successfully fetched from API: {api_url}")
-                        # Parse JSON data here
-                        return self.parse_api_data(data)
-                except:
-                    continue
-            
-            return None
-            
-        except Exception as e:
-            print(f"API fetch failed: {e}")
-            return None
+            while True:
+                kind, generation, payload = self.service.results.get_nowait()
+                if generation <= self.generation:
+                    continue  # Stragglers from a snapshot already shown or superseded
+                if kind == "event":
+                    self.streamed_events[payload.name] = payload
+                    streamed = True
+                elif kind == "done":
+                    self.generation = generation
+                    self.finish_refresh(payload)
+                    return
+        except queue.Empty:
+            pass
+        if streamed:
+            self.display_streamed_events()
+        self.poll_job = self.root.after(POLL_INTERVAL, self.poll_results)
     
-    def parse_api_data(self, data):
-        """Parse event data from API response"""
-        events = []
-        # This will need to be adjusted based on actual API structure
-        if isinstance(data, dict) and 'events' in data:
-            for event_data in data.get('events', []):
-                event = EventTimer(
-                    name=event_data.get('name', ''),
-                    status=event_data.get('status', 'Upcoming'),
-                    locations=event_data.get('locations', []),
-                    time_info=event_data.get('time', ''),
-                    countdown_seconds=event_data.get('countdown', 0),
-                    upcoming_windows=event_data.get('windows', [])
-                )
-                events.append(event)
-        return events if events else None
+    def finish_refresh(self, snapshot):
+        """Show the outcome of a refresh (a FetchSnapshot) and plan the next one"""
+        self.streamed_events = None
+        events = list(snapshot.events)
+        
+        status_text = f"Last updated: {datetime.now().strftime('%I:%M:%S %p')}"
+        
+        if events and schedule_fingerprint(events) == self.shown_fingerprint:
+            # Same schedule as on screen: only the deadlines move, the cards stay as they are
+            self.adopt_events(events)
+            self.service.publish(self.events, snapshot.source)
+            self.status_label.config(text=status_text + f" ({len(events)} events, unchanged)")
+            self.refresh_btn.config(state=tk.NORMAL)
+            self.schedule_refresh()
+            return
+        
+        # An unconfirmed projection only replaces events that have run out
+        now = monotonic_now()
+        expired = not self.events or any(event.deadline <= now for event in self.events)
+        if events:
+            self.events = events
+            source = snapshot.source
+            status_text += f" ({len(events)} events loaded)"
+        elif (self.service.projection.is_confirmed() or expired) and self.project_events():
+            source = "projection"
+            status_text = "Offline: showing projected schedule"
+        elif self.events:
+            # Keep the last good events on screen while offline
+            source = "snapshot"
+            status_text = "Offline: showing last known events"
+        else:
+            self.events = []
+            source = None
+            status_text = "ERROR: Failed to fetch events from website"
+        
+        self.display_events()
+        self.service.publish(self.events, source)
+        self.status_label.config(text=status_text)
+        self.refresh_btn.config(state=tk.NORMAL)
+        self.schedule_refresh(failed=not events)
     
-    def fetch_events(self):
-        """Fetch events from the MetaForge website"""
-        # First try API
-        api_events = self.fetch_events_from_api()
-        if api_events:
-            return api_events
-        
-        # Fall back to web scraping
-        try:
-            url = "https://metaforge.app/arc-raiders/event-timers"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.9',
-            }
-            
-            print("Fetching events from MetaForge website...")
-            response = requests.get(url, headers=headers, timeout=15)
-            response.raise_for_status()
-            
-            html_content = response.text
-            
-            # Save HTML for debugging (save in parent directory)
-            if DEBUG_MODE:
-                try:
-                    script_dir = os.path.dirname(os.path.abspath(__file__))
-                    parent_dir = os.path.dirname(script_dir)
-                    debug_file = os.path.join(parent_dir, 'debug_response.html')
-                    with open(debug_file, 'w', encoding='utf-8') as f:
-                        f.write(html_content)
-                    print(f"Debug: Saved HTML response to {debug_file}")
-                except:
-                    pass
-            
-            soup = BeautifulSoup(html_content, 'lxml')
-            events = []
-            
-            print("Parsing event cards from HTML...")
-            
-            # Find all event cards - they have specific class patterns
-            # Look for divs that contain event information
-            event_cards = soup.find_all('div', class_=lambda x: x and 'bg-secondary/70' in x)
-            
-            print(f"Found {len(event_cards)} event cards")
-            
-            for card in event_cards:
-                try:
-                    # Extract event name from h4
-                    name_elem = card.find('h4', class_=lambda x: x and 'text-foreground' in x and 'font-semibold' in x)
-                    if not name_elem:
-                        continue
-                    
-                    event_name = name_elem.get_text(strip=True)
-                    
-                    # Extract status from badge
-                    status = "Upcoming"
-                    status_badge = card.find('span', class_=lambda x: x and ('text-green-400' in x or 'text-blue-400' in x))
-                    if status_badge:
-                        badge_text = status_badge.get_text(strip=True)
-                        if 'Active' in badge_text:
-                            status = "Active"
-                    
-                    # Extract locations
-                    locations = []
-                    location_elem = card.find('div', class_=lambda x: x and 'text-muted-foreground' in x and 'text-xs' in x and 'uppercase' in x)
-                    if location_elem:
-                        location_text = location_elem.get_text(strip=True)
-                        for loc in ["Dam", "Spaceport", "Buried City", "Blue Gate"]:
-                            if loc in location_text:
-                                locations.append(loc)
-                    
-                    # Extract countdown
-                    countdown_seconds = 0
-                    countdown_elem = card.find('span', class_=lambda x: x and 'text-lg' in x and 'font-semibold' in x and 'text-white' in x)
-                    if countdown_elem:
-                        countdown_text = countdown_elem.get_text(strip=True)
-                        countdown_seconds = self.parse_countdown(countdown_text)
-                    
-                    # Extract time range and convert to local timezone
-                    time_info = ""
-                    time_elem = card.find('div', class_=lambda x: x and 'text-foreground/90' in x and 'text-sm' in x and 'font-medium' in x)
-                    if time_elem:
-                        utc_time_info = time_elem.get_text(strip=True)
-                        time_info = self.convert_time_range_to_local(utc_time_info)
-                    
-                    # Extract upcoming windows and convert times to local timezone
-                    upcoming_windows = []
-                    windows_container = card.find('div', class_=lambda x: x and 'divide-border' in x)
-                    if windows_container:
-                        window_divs = windows_container.find_all('div', class_=lambda x: x and 'py-1.5' in x)
-                        for window_div in window_divs[:5]:  # Limit to 5
-                            window_text = window_div.get_text(separator=' ', strip=True)
-                            # Convert time range in window text
-                            # Format is like "5:00 AM - 6:00 AM Dam in 3h 38m 42s"
-                            time_range_match = re.search(r'(\d{1,2}:\d{2}\s*[AP]M)\s*-\s*(\d{1,2}:\d{2}\s*[AP]M)', window_text)
-                            if time_range_match:
-                                utc_range = f"{time_range_match.group(1)} - {time_range_match.group(2)}"
-                                local_range = self.convert_time_range_to_local(utc_range)
-                                window_text = window_text.replace(utc_range, local_range)
-                            upcoming_windows.append(window_text)
-                    
-                    if event_name and (countdown_seconds > 0 or locations):
-                        event = EventTimer(
-                            name=event_name,
-                            status=status,
-                            locations=locations if locations else ["Multiple Locations"],
-                            time_info=time_info,
-                            countdown_seconds=countdown_seconds,
-                            upcoming_windows=upcoming_windows
-                        )
-                        events.append(event)
-                        print(f"✓ Parsed: {event_name} - {status} - {self.format_countdown(countdown_seconds)}")
-                        
-                except Exception as e:
-                    print(f"Error parsing card: {e}")
-                    continue
-            
-            if events:
-                print(f"\n✓ Successfully parsed {len(events)} events from website")
-                return events
-            else:
-                print("ERROR: No events parsed from website")
-                return self.create_error_placeholder()
-            
-        except Exception as e:
-            print(f"ERROR fetching events: {e}")
-            import traceback
-            traceback.print_exc()
-            return self.create_error_placeholder()
+    def adopt_events(self, events):
+        """Point the cards on screen at the events of an identical fetch, and so at its deadlines"""
+        adopted = dict(zip(sorted(self.events, key=event_fingerprint), sorted(events, key=event_fingerprint)))
+        for card in self.cards.values():
+            old_event = card['event']
+            event = card['event'] = adopted.get(old_event, old_event)
+            entry = self.countdown_registry.pop(old_event, None)
+            if entry is not None:
+                self.countdown_registry[event] = entry
+        self.events = [adopted.get(event, event) for event in self.events]
+        # The countdown loop stops at zero; restart it in case a deadline moved out
+        if self.countdown_job is None:
+            self.update_countdowns()
     
-    def create_error_placeholder(self):
-        """Create an error placeholder to indicate fetch failed"""
-        return []
+    def display_streamed_events(self):
+        """Show the cards streamed so far on top of the ones already on screen"""
+        streamed = self.streamed_events
+        if not streamed:
+            return
+        known = {event.name: event for event in self.events}
+        if self.shown_fingerprint is not None and all(
+                name in known and event_fingerprint(known[name]) == event_fingerprint(event)
+                for name, event in streamed.items()):
+            return  # Nothing new so far; finish_refresh syncs the deadlines
+        shown = [streamed.get(event.name, event) for event in self.events]
+        self.display_events(shown + [event for name, event in streamed.items() if name not in known])
+        self.shown_fingerprint = None
     
-    def fetch_and_display_events(self):
-        """Fetch events in a separate thread and display them"""
-        self.status_label.config(text="Loading...")
-        self.refresh_btn.config(state=tk.DISABLED)
-        
-        def fetch_thread():
-            self.events = self.fetch_events()
-            event_count = len(self.events)
-            
-            status_text = f"Last updated: {datetime.now().strftime('%I:%M:%S %p')}"
-            
-            if event_count == 0:
-                status_text = "ERROR: Failed to fetch events from website"
-            else:
-                status_text += f" ({event_count} events loaded)"
-            
-            self.root.after(0, self.display_events)
-            self.root.after(0, lambda: self.status_label.config(text=status_text))
-            self.root.after(0, lambda: self.refresh_btn.config(state=tk.NORMAL))
-            
-        thread = threading.Thread(target=fetch_thread, daemon=True)
-        thread.start()
+    def display_events(self, events=None):
+        """Display events (self.events by default), reusing the cards that are already on screen"""
+        if events is None:
+            events = self.events
+        with metrics.span("display"):
+            self.render_events(events)
     
-    def display_events(self):
-        """Display events in the GUI"""
-        # Clear existing widgets
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
+    def render_events(self, events):
+        """Reconcile the grid of cards with events"""
+        self.shown_fingerprint = schedule_fingerprint(events) if events else None
         
         # Check if we have events
-        if not self.events:
-            # Display error message - compact version
-            error_frame = tk.Frame(self.scrollable_frame, bg="#2d2d2d", relief=tk.RAISED, borderwidth=2)
-            error_frame.grid(row=0, column=0, columnspan=3, sticky="nsew", padx=15, pady=15)
-            self.scrollable_frame.grid_rowconfigure(0, weight=1)
-            self.scrollable_frame.grid_columnconfigure(0, weight=1)
-            
-            error_icon = tk.Label(
-                error_frame,
-                text="⚠",
-                font=("Arial", 36),
-                bg="#2d2d2d",
-                fg="#ef4444"
-            )
-            error_icon.pack(pady=(30, 15))
-            
-            error_title = tk.Label(
-                error_frame,
-                text="Unable to Fetch Events",
-                font=("Arial", 16, "bold"),
-                bg="#2d2d2d",
-                fg="#ffffff"
-            )
-            error_title.pack(pady=8)
-            
-            error_msg = tk.Label(
-                error_frame,
-                text="Could not retrieve event data from MetaForge website.\n\n"
-                     "Possible causes:\n"
-                     "• Website structure may have changed\n"
-                     "• Network connection issues\n"
-                     "• Website is temporarily unavailable\n\n"
-                     "Try clicking the Refresh button or check test_fetch.py for debugging.",
-                font=("Arial", 10),
-                bg="#2d2d2d",
-                fg="#aaaaaa",
-                justify=tk.CENTER
-            )
-            error_msg.pack(pady=15, padx=30)
-            
-            # Add helpful commands - more compact
-            help_frame = tk.Frame(error_frame, bg="#1a1a1a")
-            help_frame.pack(pady=15, padx=30, fill=tk.X)
-            
-            help_label = tk.Label(
-                help_frame,
-                text="Debug Commands:",
-                font=("Arial", 9, "bold"),
-                bg="#1a1a1a",
-                fg="#888888",
-                anchor="w"
-            )
-            help_label.pack(anchor="w", pady=(8, 4))
-            
-            cmd_label = tk.Label(
-                help_frame,
-                text="python3 test_fetch.py    # Test website connection\n"
-                     "cat debug_response.html  # View fetched HTML",
-                font=("Courier", 8),
-                bg="#1a1a1a",
-                fg="#4a9eff",
-                anchor="w",
-                justify=tk.LEFT
-            )
-            cmd_label.pack(anchor="w", padx=8)
-            
+        if not events:
+            self.clear_cards()
+            self.show_error_panel()
             return
         
+        if self.error_frame is not None:
+            self.error_frame.destroy()
+            self.error_frame = None
+            self.scrollable_frame.grid_rowconfigure(0, weight=0, minsize=0)
+        
         # Sort events: Active first, then by countdown
-        active_events = [e for e in self.events if e.status == "Active"]
-        upcoming_events = sorted([e for e in self.events if e.status == "Upcoming"],
+        active_events = [e for e in events if e.status == EventStatus.ACTIVE]
+        upcoming_events = sorted([e for e in events if e.status == EventStatus.UPCOMING],
                                 key=lambda x: x.countdown_seconds)
         
         all_events = active_events + upcoming_events
         
         # Display events in a 3x3 grid with proper expansion
-        row = 0
-        col = 0
         max_cols = 3
         
         # Configure all columns to expand equally (horizontal resizing)
         for i in range(max_cols):
             self.scrollable_frame.grid_columnconfigure(i, weight=1, minsize=300)
         
+        # Keyed reconciliation: reuse the card with the same key, update what
+        # changed in place, and only create/destroy cards that came or went
+        old_cards = self.cards
+        self.cards = {}
+        for index, event in enumerate(all_events):
+            row, col = divmod(index, max_cols)
+            key = self.card_key(event)
+            while key in self.cards:
+                key += (index,)
+            
+            card = old_cards.pop(key, None)
+            if card is None:
+                card = self.create_event_card(self.scrollable_frame, event, row, col)
+            else:
+                card = self.update_event_card(card, event, row, col)
+            self.cards[key] = card
+        
+        for card in old_cards.values():
+            self.destroy_event_card(card)
+        
         # Calculate number of rows needed and set them to expand (vertical resizing)
         num_rows = (len(all_events) + max_cols - 1) // max_cols
-        for i in range(num_rows):
+        for i in range(num_rows, self.grid_rows):
+            self.scrollable_frame.grid_rowconfigure(i, weight=0, minsize=0)
+        for i in range(self.grid_rows, num_rows):
             self.scrollable_frame.grid_rowconfigure(i, weight=1, minsize=200)
+        self.grid_rows = num_rows
         
-        for event in all_events:
-            self.create_event_card(self.scrollable_frame, event, row, col)
-            col += 1
-            if col >= max_cols:
-                col = 0
-                row += 1
-        
-        # Start countdown update
+        # Restart countdown updates (cancel any pending tick so only one loop runs)
+        if self.countdown_job is not None:
+            self.root.after_cancel(self.countdown_job)
+            self.countdown_job = None
         self.update_countdowns()
     
+    def clear_cards(self):
+        """Remove every event card"""
+        for card in self.cards.values():
+            self.destroy_event_card(card)
+        self.cards = {}
+        for i in range(self.grid_rows):
+            self.scrollable_frame.grid_rowconfigure(i, weight=0, minsize=0)
+        self.grid_rows = 0
+    
+    def show_error_panel(self):
+        """Display the fetch error message in place of the event grid"""
+        if self.error_frame is not None:
+            return
+        
+        # Display error message - compact version
+        error_frame = tk.Frame(self.scrollable_frame, bg="#2d2d2d", relief=tk.RAISED, borderwidth=2)
+        error_frame.grid(row=0, column=0, columnspan=3, sticky="nsew", padx=15, pady=15)
+        self.scrollable_frame.grid_rowconfigure(0, weight=1)
+        self.scrollable_frame.grid_columnconfigure(0, weight=1)
+        self.error_frame = error_frame
+        
+        error_icon = tk.Label(
+            error_frame,
+            text="⚠",
+            font=("Arial", 36),
+            bg="#2d2d2d",
+            fg="#ef4444"
+        )
+        error_icon.pack(pady=(30, 15))
+        
+        error_title = tk.Label(
+            error_frame,
+            text="Unable to Fetch Events",
+            font=("Arial", 16, "bold"),
+            bg="#2d2d2d",
+            fg="#ffffff"
+        )
+        error_title.pack(pady=8)
+        
+        error_msg = tk.Label(
+            error_frame,
+            text="Could not retrieve event data from MetaForge website.\n\n"
+                 "Possible causes:\n"
+                 "• Website structure may have changed\n"
+                 "• Network connection issues\n"
+                 "• Website is temporarily unavailable\n\n"
+                 "Try clicking the Refresh button or check test_fetch.py for debugging.",
+            font=("Arial", 10),
+            bg="#2d2d2d",
+            fg="#aaaaaa",
+            justify=tk.CENTER
+        )
+        error_msg.pack(pady=15, padx=30)
+        
+        # Add helpful commands - more compact
+        help_frame = tk.Frame(error_frame, bg="#1a1a1a")
+        help_frame.pack(pady=15, padx=30, fill=tk.X)
+        
+        help_label = tk.Label(
+            help_frame,
+            text="Debug Commands:",
+            font=("Arial", 9, "bold"),
+            bg="#1a1a1a",
+            fg="#888888",
+            anchor="w"
+        )
+        help_label.pack(anchor="w", pady=(8, 4))
+        
+        cmd_label = tk.Label(
+            help_frame,
+            text="python3 test_fetch.py                 # Test website connection\n"
+                 "Ctrl+D                                # Capture fetched responses\n"
+                 "ls ~/.cache/arc-timers/captures/      # Captured responses (.json.gz)",
+            font=("Courier", 8),
+            bg="#1a1a1a",
+            fg="#4a9eff",
+            anchor="w",
+            justify=tk.LEFT
+        )
+        cmd_label.pack(anchor="w", padx=8)
+    
+    def card_key(self, event):
+        """Identity of a card across refreshes: event name plus its window"""
+        return (event.name, event.time_info)
+    
+    def card_layout(self, event):
+        """Which optional rows a card has; a change here needs a rebuilt card"""
+        return (bool(event.time_info), min(event.window_count, 2))
+    
+    def card_fields(self, event):
+        """Widget options for every text a card shows, keyed by widget name"""
+        # Locations - compact
+        locations_text = ", ".join(event.locations)
+        if len(locations_text) > 35:
+            locations_text = locations_text[:32] + "..."
+        
+        fields = {
+            'status': {
+                'text': event.status.upper(),
+                'bg': "#22c55e" if event.status == EventStatus.ACTIVE else "#3b82f6",
+            },
+            'name': {'text': event.name},
+            'locations': {'text': locations_text.upper()},
+            'time': {'text': event.time_info},
+            'caption': {'text': "ENDS IN" if event.status == EventStatus.ACTIVE else "STARTS IN"},
+        }
+        now = time.time()
+        for i, window in enumerate(event.windows[:2]):  # Show first 2
+            # Truncate long window text
+            text = window.text(now)
+            fields[f'window{i}'] = {'text': text if len(text) <= 38 else text[:35] + "..."}
+        return fields
+    
     def create_event_card(self, parent, event, row, col):
-        """Create a card widget for an event"""
+        """Create a card widget for an event and return its record"""
+        fields = self.card_fields(event)
+        widgets = {}
+        
         # Card frame - compact but readable, expands in all directions
         card = tk.Frame(parent, bg="#2d2d2d", relief=tk.RAISED, borderwidth=2)
         card.grid(row=row, column=col, padx=6, pady=6, sticky="nsew")
         
         # Status badge - more compact
-        status_color = "#22c55e" if event.status == "Active" else "#3b82f6"
         status_badge = tk.Label(
             card,
-            text=event.status.upper(),
-            bg=status_color,
+            **fields['status'],
             fg="#ffffff",
             font=("Arial", 9, "bold"),
             padx=8,
             pady=2
         )
         status_badge.pack(anchor="nw", padx=10, pady=8)
+        widgets['status'] = status_badge
         
         # Event name
         name_label = tk.Label(
             card,
-            text=event.name,
+            **fields['name'],
             font=("Arial", 14, "bold"),
             bg="#2d2d2d",
             fg="#ffffff",
@@ -593,48 +573,49 @@ class ArcTimersGUI:
             wraplength=350
         )
         name_label.pack(fill=tk.X, padx=10, pady=(0, 4))
+        widgets['name'] = name_label
         
         # Locations - compact
-        locations_text = ", ".join(event.locations)
-        if len(locations_text) > 35:
-            locations_text = locations_text[:32] + "..."
         locations_label = tk.Label(
             card,
-            text=locations_text.upper(),
+            **fields['locations'],
             font=("Arial", 9),
             bg="#2d2d2d",
             fg="#888888",
             anchor="w"
         )
         locations_label.pack(fill=tk.X, padx=10, pady=(0, 6))
+        widgets['locations'] = locations_label
         
         # Time info - compact
         if event.time_info:
             time_label = tk.Label(
                 card,
-                text=event.time_info,
+                **fields['time'],
                 font=("Arial", 11, "bold"),
                 bg="#2d2d2d",
                 fg="#ffffff",
                 anchor="w"
             )
             time_label.pack(fill=tk.X, padx=10, pady=(0, 4))
+            widgets['time'] = time_label
         
         # Countdown
-        countdown_text = "ENDS IN" if event.status == "Active" else "STARTS IN"
         countdown_label = tk.Label(
             card,
-            text=countdown_text,
+            **fields['caption'],
             font=("Arial", 9),
             bg="#2d2d2d",
             fg="#888888",
             anchor="w"
         )
         countdown_label.pack(fill=tk.X, padx=10, pady=(2, 0))
+        widgets['caption'] = countdown_label
         
+        value_text = self.format_countdown(event.countdown_seconds)
         countdown_value = tk.Label(
             card,
-            text=self.format_countdown(event.countdown_seconds),
+            text=value_text,
             font=("Arial", 20, "bold"),
             bg="#2d2d2d",
             fg="#4a9eff",
@@ -642,11 +623,11 @@ class ArcTimersGUI:
         )
         countdown_value.pack(fill=tk.X, padx=10, pady=(1, 6))
         
-        # Store reference for updates
-        countdown_value.event = event
+        # Register for updates so the tick never has to walk the widget tree
+        self.countdown_registry[event] = [countdown_value, value_text]
         
         # Upcoming windows - show first 2, more compact
-        if event.upcoming_windows:
+        if event.window_count:
             windows_label = tk.Label(
                 card,
                 text="UPCOMING",
@@ -657,67 +638,150 @@ class ArcTimersGUI:
             )
             windows_label.pack(fill=tk.X, padx=10, pady=(4, 2))
             
-            for window in event.upcoming_windows[:2]:  # Show first 2
-                # Truncate long window text
-                window_text = window if len(window) <= 38 else window[:35] + "..."
+            for i in range(min(event.window_count, 2)):  # Show first 2
                 window_label = tk.Label(
                     card,
-                    text=window_text,
+                    **fields[f'window{i}'],
                     font=("Arial", 8),
                     bg="#2d2d2d",
                     fg="#aaaaaa",
                     anchor="w"
                 )
                 window_label.pack(fill=tk.X, padx=10, pady=1)
+                widgets[f'window{i}'] = window_label
         
         # Add small bottom padding
         tk.Label(card, bg="#2d2d2d").pack(pady=4)
+        
+        return {
+            'frame': card,
+            'event': event,
+            'position': (row, col),
+            'layout': self.card_layout(event),
+            'fields': fields,
+            'widgets': widgets,
+            'countdown': countdown_value,
+        }
+    
+    def update_event_card(self, card, event, row, col):
+        """Bring an existing card up to date, touching only what changed"""
+        if self.card_layout(event) != card['layout']:
+            # Optional rows appeared or disappeared; rebuild just this card
+            self.destroy_event_card(card)
+            return self.create_event_card(self.scrollable_frame, event, row, col)
+        
+        if card['position'] != (row, col):
+            card['frame'].grid(row=row, column=col)
+            card['position'] = (row, col)
+        
+        fields = self.card_fields(event)
+        for name, options in fields.items():
+            if card['fields'].get(name) != options and name in card['widgets']:
+                card['widgets'][name].config(**options)
+        card['fields'] = fields
+        
+        # Hand the countdown label over to the new event object
+        old_event = card['event']
+        if old_event is not event:
+            entry = self.countdown_registry.pop(old_event, None)
+            if entry is None:
+                entry = [card['countdown'], None]
+            self.countdown_registry[event] = entry
+            card['event'] = event
+        return card
+    
+    def destroy_event_card(self, card):
+        """Destroy a card and forget its countdown label"""
+        self.countdown_registry.pop(card['event'], None)
+        card['frame'].destroy()
     
     def update_countdowns(self):
         """Update all countdown timers"""
         if not self.running:
             return
             
-        try:
-            has_zero_countdown = False
-            
-            # Find all countdown labels and update them
-            for widget in self.scrollable_frame.winfo_children():
-                for child in widget.winfo_children():
-                    if isinstance(child, tk.Label) and hasattr(child, 'event'):
-                        event = child.event
-                        if event.countdown_seconds > 0:
-                            event.countdown_seconds -= 1
-                            child.config(text=self.format_countdown(event.countdown_seconds))
-                        
-                        if event.countdown_seconds == 0:
-                            has_zero_countdown = True
-            
-            # Only trigger refresh once when countdown hits 0, with a cooldown
-            current_time = time.time()
-            if has_zero_countdown and not self.refresh_triggered:
-                if current_time - self.last_refresh_time > 60:  # 60 second cooldown
-                    self.refresh_triggered = True
-                    self.last_refresh_time = current_time
-                    print("Event countdown reached 0, refreshing data...")
-                    self.root.after(100, self.auto_refresh)
-                    return
-            
-            # Schedule next update
-            self.root.after(1000, self.update_countdowns)
-            
-        except Exception as e:
-            print(f"Error updating countdowns: {e}")
-            self.root.after(1000, self.update_countdowns)
+        with metrics.span("tick"):
+            try:
+                now = monotonic_now()
+                next_change = None
+                
+                # Values are derived from each event's deadline, so a late tick
+                # simply catches up; only labels whose text changed are touched
+                for event, entry in self.countdown_registry.items():
+                    remaining = event.remaining(now)
+                    text = self.format_countdown(int(math.ceil(remaining)))
+                    if text != entry[1]:
+                        entry[0].config(text=text)
+                        entry[1] = text
+                    
+                    if remaining > 0:
+                        next_change = min(next_change or 1.0, (remaining % 1) or 1.0)
+                
+                # Wake up just after the next displayed second rolls over; once
+                # everything is at zero the next display_events restarts the loop
+                if next_change is None:
+                    self.countdown_job = None
+                else:
+                    self.countdown_job = self.root.after(self.next_tick_delay(next_change), self.update_countdowns)
+                
+            except Exception as e:
+                print(f"Error updating countdowns: {e}")
+                self.countdown_job = self.root.after(1000, self.update_countdowns)
+    
+    def next_tick_delay(self, next_change):
+        """Milliseconds until the next countdown label changes value"""
+        return max(20, int(next_change * 1000) + 5)
+    
+    def project_events(self):
+        """Replace the events with the locally projected schedule, if it covers them all"""
+        events = self.service.project_events([event.name for event in self.events])
+        if not events:
+            return False
+        self.events = events
+        return True
     
-    def auto_refresh(self):
-        """Auto refresh after countdown expires"""
-        self.fetch_and_display_events()
-        self.refresh_triggered = False
+    def schedule_refresh(self, failed=False, fetched=True):
+        """Plan the next automatic refresh from the deadlines now on screen"""
+        if not self.running:
+            return
+        if self.refresh_job is not None:
+            self.root.after_cancel(self.refresh_job)
+        
+        now = monotonic_now()
+        if fetched:
+            self.refresh_scheduler.record_fetch(now)
+        self.refresh_scheduler.plan(self.events, now)
+        delay, reason = self.refresh_scheduler.next_refresh(
+            now, failed=failed, projected=self.service.projection.is_confirmed(),
+            retry_after=self.service.retry_delay() if failed else 0.0)
+        print(f"Next refresh in {self.format_countdown(int(delay))} ({reason})")
+        self.refresh_job = self.root.after(int(delay * 1000), lambda: self.auto_refresh(reason))
+    
+    def auto_refresh(self, reason="scheduled"):
+        """Auto refresh planned by the refresh scheduler"""
+        self.refresh_job = None
+        # Once the projection has been confirmed, transitions roll over locally
+        # and the network is only used by the slower periodic revalidation
+        if reason == "event transition" and self.service.projection.is_confirmed() and self.project_events():
+            print("Rolling events over from the projected schedule")
+            metrics.incr("refreshes", reason="projected rollover")
+            self.display_events()
+            self.service.publish(self.events, "projection")
+            self.status_label.config(
+                text=f"Projected locally: {datetime.now().strftime('%I:%M:%S %p')} ({len(self.events)} events)")
+            self.schedule_refresh(fetched=False)
+            return
+        print(f"Refreshing data: {reason}")
+        self.fetch_and_display_events(reason)
     
     def on_closing(self):
         """Handle window closing"""
         self.running = False
+        if self.poll_job is not None:
+            self.root.after_cancel(self.poll_job)
+        self.close_stats_panel()
+        if self.service is not None:
+            self.service.close()
         self.root.destroy()
 
 
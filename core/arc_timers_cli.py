@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+ARC Raiders Event Timer - Headless CLI
+Prints the current events as JSON, or keeps a JSON file up to date as a daemon.
+Does not import tkinter or PIL, so it runs on machines without a display.
+
+Usage:
+    python3 core/arc_timers_cli.py                      # one-shot JSON on stdout
+    python3 core/arc_timers_cli.py --output events.json # one-shot, written atomically
+    python3 core/arc_timers_cli.py --daemon --output events.json
+    python3 core/arc_timers_cli.py --daemon --serve 8765    # also serve http://127.0.0.1:8765/events.json
+    python3 core/arc_timers_cli.py --replay ~/.cache/arc-timers/captures/<capture>.json.gz
+    python3 core/arc_timers_cli.py --daemon --output events.json --metrics metrics.prom  # timings, Prometheus text
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import signal
+import sys
+import threading
+
+from debug_capture import load_capture
+from event_model import format_countdown, monotonic_now
+from event_service import EventService
+from metrics import metrics
+from refresh_scheduler import RefreshScheduler
+from snapshot_cache import events_payload, load_snapshot
+
+
+def write_payload(payload, output=None, pretty=False, stream=None):
+    """Write the payload to ``stream`` (stdout), or atomically replace the output file"""
+    text = json.dumps(payload, indent=2 if pretty else None, ensure_ascii=False)
+    if not output:
+        stream = stream or sys.stdout
+        stream.write(text + "\n")
+        stream.flush()
+        return
+    directory = os.path.dirname(os.path.abspath(output))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{output}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text + "\n")
+    os.replace(tmp_path, output)
+
+
+def current_events(service, names=None, offline=False):
+    """Return (events, source): the network first, then the projection, then the snapshot"""
+    if not offline:
+        events = service.fetch_events()
+        if events:
+            return events, service.last_source
+    events = service.project_events(names)
+    if events:
+        return events, "projection"
+    events, _ = load_snapshot()
+    if events:
+        return events, "snapshot"
+    return [], None
+
+
+def run_replay(service, args, stream):
+    """Re-parse a debug capture as of its capture time and print the result"""
+    record = load_capture(args.replay)
+    events = service.replay_capture(record) or []
+    payload = events_payload(events, f"replay:{record['source']}", now=record["captured_at"])
+    write_payload(payload, args.output, args.pretty, stream)
+    return 0 if events else 1
+
+
+def run_once(service, args, stream):
+    events, source = current_events(service, offline=args.offline)
+    write_payload(events_payload(events, source), args.output, args.pretty, stream)
+    return 0 if events else 1
+
+
+def run_daemon(service, args, stream):
+    """Refresh on the same deadline-driven schedule as the GUI until signalled"""
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+
+    scheduler = RefreshScheduler()
+    events, source = current_events(service, offline=args.offline)
+    # As in the GUI: fetched when the network answered, failed when it was
+    # asked and didn't; a projected rollover is neither
+    fetched = source not in ("projection", "snapshot", None)
+    failed = not (fetched or args.offline)
+    while not stop.is_set():
+        write_payload(events_payload(events, source), args.output, args.pretty, stream)
+        service.publish(events, source)
+        if args.metrics:
+            metrics.write_dump(args.metrics)
+
+        now = monotonic_now()
+        if fetched:
+            scheduler.record_fetch(now)
+        scheduler.plan(events, now)
+        delay, reason = scheduler.next_refresh(
+            now, failed=failed, projected=service.projection.is_confirmed(),
+            retry_after=service.retry_delay() if failed else 0.0)
+        print(f"Next refresh in {format_countdown(int(delay))} ({reason})")
+        if stop.wait(delay):
+            break
+
+        names = [event.name for event in events]
+        if reason == "event transition" and service.projection.is_confirmed():
+            projected = service.project_events(names)
+            if projected:
+                print("Rolling events over from the projected schedule")
+                metrics.incr("refreshes", reason="projected rollover")
+                events, source, fetched, failed = projected, "projection", False, False
+                continue
+        print(f"Refreshing data: {reason}")
+        metrics.incr("refreshes", reason=reason)
+        fresh, fresh_source = current_events(service, names, offline=args.offline)
+        fetched = fresh_source not in ("projection", "snapshot", None)
+        failed = not (fetched or args.offline)
+        if fresh:
+            events, source = fresh, fresh_source
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print ARC Raiders event timers as JSON without a GUI")
+    parser.add_argument("--daemon", action="store_true",
+                        help="keep running and rewrite the output whenever the events change")
+    parser.add_argument("-o", "--output", help="write JSON to this file (atomically) instead of stdout")
+    parser.add_argument("--pretty", action="store_true", help="indent the JSON output")
+    parser.add_argument("--offline", action="store_true",
+                        help="never touch the network; use the projected schedule or the cached snapshot")
+    parser.add_argument("--capture", action="store_true",
+                        help="keep compressed copies of fetched responses in the cache dir")
+    parser.add_argument("--replay", metavar="CAPTURE", help="parse a debug capture instead of fetching")
+    parser.add_argument("--serve", metavar="[HOST:]PORT", nargs="?", const="1",
+                        help="with --daemon, serve the events as JSON and SSE on localhost (default port 8765)")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="write timings and counters to FILE (Prometheus text for *.prom, else JSON)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="suppress progress messages")
+    args = parser.parse_args(argv)
+    if args.serve and not args.daemon:
+        parser.error("--serve requires --daemon")
+    if args.serve:
+        from event_server import parse_address
+        try:
+            parse_address(args.serve)
+        except ValueError as e:
+            parser.error(f"--serve: {e}")
+
+    # Progress messages go to stderr (or nowhere) so stdout stays valid JSON
+    stream = sys.stdout
+    log = open(os.devnull, "w") if args.quiet else sys.stderr
+    with contextlib.redirect_stdout(log):
+        service = EventService(serve_address=args.serve)
+        if args.capture:
+            service.capture.enabled = True
+        try:
+            if args.replay:
+                return run_replay(service, args, stream)
+            if args.daemon:
+                return run_daemon(service, args, stream)
+            return run_once(service, args, stream)
+        finally:
+            service.close()
+            if args.metrics:
+                metrics.write_dump(args.metrics)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
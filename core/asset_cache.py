@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+ARC Raiders Event Timer - Asset Cache
+Pre-scaled copies of the app logo, rendered once and loaded straight into Tk
+"""
+
+import hashlib
+import os
+
+from snapshot_cache import get_cache_dir
+
+ASSET_DIR = "assets"
+
+
+def get_asset_dir():
+    return os.path.join(get_cache_dir(), ASSET_DIR)
+
+
+def source_digest(source):
+    """Short content hash of the source image; a changed logo gets new cache files"""
+    with open(source, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def _render(source, size, path):
+    """Resize source to size x size with Pillow and write it atomically as PNG"""
+    from PIL import Image
+
+    with Image.open(source) as image:
+        scaled = image.resize((size, size), Image.Resampling.LANCZOS)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    scaled.save(tmp_path, format="PNG")
+    os.replace(tmp_path, path)
+
+
+def _prune(asset_dir, stem, digest):
+    """Drop renders of older versions of the same source image"""
+    for name in os.listdir(asset_dir):
+        if name.startswith(f"{stem}-") and not name.startswith(f"{stem}-{digest}-"):
+            try:
+                os.remove(os.path.join(asset_dir, name))
+            except OSError:
+                pass
+
+
+def scaled_assets(source, sizes):
+    """Return {size: path} of square PNG renders of source, building missing ones.
+
+    Cached renders are plain PNGs that tk.PhotoImage reads directly, so Pillow
+    is only imported when one has to be (re)built. Sizes that cannot be built
+    (Pillow missing, unwritable cache) are left out of the result.
+    """
+    digest = source_digest(source)
+    stem = os.path.splitext(os.path.basename(source))[0]
+    asset_dir = get_asset_dir()
+    paths = {}
+    rebuilt = False
+    for size in sizes:
+        path = os.path.join(asset_dir, f"{stem}-{digest}-{size}.png")
+        if not os.path.exists(path):
+            try:
+                os.makedirs(asset_dir, exist_ok=True)
+                _render(source, size, path)
+                rebuilt = True
+            except (ImportError, OSError) as e:
+                print(f"Could not build {size}px asset from {source}: {e}")
+                continue
+        paths[size] = path
+    if rebuilt:
+        _prune(asset_dir, stem, digest)
+    return paths
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+ARC Raiders Event Timer - Debug Capture
+Background, compressed, size-bounded store of fetched responses and what was
+parsed from them, replayable as offline fixtures
+"""
+
+import gzip
+import itertools
+import json
+import os
+import queue
+import re
+import threading
+import time
+
+from snapshot_cache import event_to_dict, get_cache_dir
+
+CAPTURE_VERSION = 1
+CAPTURE_DIR = "captures"
+CAPTURE_SUFFIX = ".json.gz"
+MAX_CAPTURES = 20
+MAX_CAPTURE_BYTES = 16 * 1024 * 1024
+QUEUE_SIZE = 8  # Captures waiting for the writer; more are dropped, never blocking a fetch
+
+
+def get_capture_dir():
+    return os.path.join(get_cache_dir(), CAPTURE_DIR)
+
+
+def list_captures(directory=None):
+    """Capture files in directory, oldest first (names sort chronologically)"""
+    directory = directory or get_capture_dir()
+    try:
+        names = sorted(name for name in os.listdir(directory) if name.endswith(CAPTURE_SUFFIX))
+    except FileNotFoundError:
+        return []
+    return [os.path.join(directory, name) for name in names]
+
+
+def load_capture(path):
+    """Read one capture back as a dict (body, captured_at, source, url, content_type, events)"""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        record = json.load(f)
+    if record.get("version") != CAPTURE_VERSION:
+        raise ValueError(f"unsupported capture version in {path}")
+    return record
+
+
+class DebugCapture:
+    """Keeps the last responses on disk while enabled; costs nothing while disabled.
+
+    capture() only serializes the parse result and queues the record, and a
+    daemon writer thread compresses it into the cache directory and drops the
+    oldest captures beyond ``max_entries`` or ``max_bytes``. It can be turned
+    on and off at any time through ``enabled``.
+    """
+
+    def __init__(self, directory=None, enabled=False, max_entries=MAX_CAPTURES, max_bytes=MAX_CAPTURE_BYTES):
+        self.directory = directory or get_capture_dir()
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self._writer = None
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+
+    def capture(self, source, url, body, events, content_type="text/html", captured_at=None):
+        """Queue a response and the events parsed from it (None if parsing failed)"""
+        if not self.enabled:
+            return
+        if captured_at is None:
+            captured_at = time.time()
+        record = {
+            "version": CAPTURE_VERSION,
+            "captured_at": captured_at,
+            "source": source,
+            "url": url,
+            "content_type": content_type,
+            "body": body,
+            "events": [event_to_dict(event, captured_at) for event in events or []],
+        }
+        try:
+            self._queue.put_nowait((next(self._sequence), record))
+        except queue.Full:
+            self.dropped += 1
+            return
+        self._start_writer()
+
+    def _start_writer(self):
+        with self._lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name="debug-capture", daemon=True)
+                self._writer.start()
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item)
+                self._rotate()
+            except OSError as e:
+                print(f"Could not write debug capture: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, sequence, record):
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.gmtime(record["captured_at"]))
+        source = re.sub(r"[^A-Za-z0-9]+", "-", record["source"]).strip("-")[:60]
+        path = os.path.join(self.directory, f"{stamp}-{sequence:04d}-{source}{CAPTURE_SUFFIX}")
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+            json.dump(record, f)
+        os.replace(tmp_path, path)
+        print(f"Debug: captured {record['source']} response to {path}")
+
+    def _rotate(self):
+        """Drop the oldest captures until both limits hold (the newest is always kept)"""
+        captures = []
+        for path in list_captures(self.directory):
+            try:
+                captures.append((path, os.path.getsize(path)))
+            except OSError:
+                continue
+        total = sum(size for _, size in captures)
+        while len(captures) > 1 and (len(captures) > self.max_entries or total > self.max_bytes):
+            path, size = captures.pop(0)
+            total -= size
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def close(self, timeout=2.0):
+        """Let queued captures finish writing, then stop the writer"""
+        with self._lock:
+            writer = self._writer
+        if writer is None or not writer.is_alive():
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        writer.join(timeout)
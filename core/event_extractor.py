@@ -0,0 +1,554 @@
+#!/usr/bin/env python3
+"""
+ARC Raiders Event Timer - Event Extractor
+Single-pass extraction of event cards from the MetaForge event-timers page
+"""
+
+import json
+import re
+import time
+from datetime import datetime, timezone
+
+# Re-exported: the countdown helpers used to live here
+from event_model import EventStatus, EventTimer, EventWindow, format_countdown, parse_countdown  # noqa: F401
+from metrics import metrics
+from snapshot_cache import event_from_dict
+
+KNOWN_LOCATIONS = ["Dam", "Spaceport", "Buried City", "Blue Gate"]
+
+# Compiled once on first use; matching uses substring semantics on @class like the old scan
+_EVENT_CARDS = "//div[contains(@class, 'bg-secondary/70')]"
+_WINDOW_ROWS = ".//div[contains(@class, 'py-1.5')]"
+# bs4's get_text() skips script/style content and comments; so does this
+_TEXT_NODES = ".//text()[not(parent::script or parent::style)]"
+_XPATHS = {}
+
+_TIME_RANGE = re.compile(r'(\d{1,2}:\d{2}\s*[AP]M)\s*-\s*(\d{1,2}:\d{2}\s*[AP]M)')
+
+MAX_WINDOWS = 5
+
+
+def _xpath(expression):
+    """Compiled XPath for expression. lxml is only imported here and in
+    parse_document, so the embedded-data path never loads it."""
+    compiled = _XPATHS.get(expression)
+    if compiled is None:
+        from lxml import etree
+        compiled = _XPATHS[expression] = etree.XPath(expression)
+    return compiled
+
+
+def element_text(element, separator=''):
+    """Equivalent of BeautifulSoup's get_text(separator, strip=True)"""
+    parts = [text.strip() for text in _xpath(_TEXT_NODES)(element)]
+    return separator.join(part for part in parts if part)
+
+
+def parse_document(html_content):
+    """Build an lxml tree from a str or bytes HTML document"""
+    if isinstance(html_content, str):
+        html_content = html_content.encode('utf-8')
+    from lxml import etree
+    parser = etree.HTMLParser(encoding='utf-8')
+    return etree.fromstring(html_content, parser)
+
+
+def _card_fields(card):
+    """Walk a card once and return the first element matching each field"""
+    name_elem = status_elem = location_elem = None
+    countdown_elem = time_elem = windows_elem = None
+
+    for elem in card.iter('h4', 'span', 'div'):
+        classes = elem.get('class')
+        if not classes:
+            continue
+        tag = elem.tag
+        if tag == 'h4':
+            if name_elem is None and 'text-foreground' in classes and 'font-semibold' in classes:
+                name_elem = elem
+        elif tag == 'span':
+            if status_elem is None and ('text-green-400' in classes or 'text-blue-400' in classes):
+                status_elem = elem
+            if (countdown_elem is None and 'text-lg' in classes
+                    and 'font-semibold' in classes and 'text-white' in classes):
+                countdown_elem = elem
+        else:
+            if (location_elem is None and 'text-muted-foreground' in classes
+                    and 'text-xs' in classes and 'uppercase' in classes):
+                location_elem = elem
+            if (time_elem is None and 'text-foreground/90' in classes
+                    and 'text-sm' in classes and 'font-medium' in classes):
+                time_elem = elem
+            if windows_elem is None and 'divide-border' in classes:
+                windows_elem = elem
+
+    return name_elem, status_elem, location_elem, countdown_elem, time_elem, windows_elem
+
+
+def _convert_ranges(convert_range, ranges):
+    """Convert a list of ranges, in one batch if convert_range supports it"""
+    with metrics.span("convert_times"):
+        batch = getattr(convert_range, 'batch', None)
+        if batch is not None:
+            return batch(ranges)
+        return [convert_range(time_range) for time_range in ranges]
+
+
+def extract_card(card, convert_range=None):
+    """Turn one event card element into an EventTimer, or None if it is not usable"""
+    name_elem, status_elem, location_elem, countdown_elem, time_elem, windows_elem = _card_fields(card)
+    if name_elem is None:
+        return None
+
+    event_name = element_text(name_elem)
+
+    status = EventStatus.UPCOMING
+    if status_elem is not None and 'Active' in element_text(status_elem):
+        status = EventStatus.ACTIVE
+
+    locations = []
+    if location_elem is not None:
+        location_text = element_text(location_elem)
+        locations = [loc for loc in KNOWN_LOCATIONS if loc in location_text]
+
+    countdown_seconds = 0
+    if countdown_elem is not None:
+        countdown_seconds = parse_countdown(element_text(countdown_elem))
+
+    time_info = ""
+    if time_elem is not None:
+        time_info = element_text(time_elem)
+
+    upcoming_windows = []
+    utc_ranges = []
+    if windows_elem is not None:
+        for window_div in _xpath(_WINDOW_ROWS)(windows_elem)[:MAX_WINDOWS]:
+            window_text = element_text(window_div, ' ')
+            # Format is like "5:00 AM - 6:00 AM Dam in 3h 38m 42s"
+            match = _TIME_RANGE.search(window_text) if convert_range else None
+            upcoming_windows.append(window_text)
+            utc_ranges.append(f"{match.group(1)} - {match.group(2)}" if match else None)
+
+    if convert_range:
+        # The card's own range and all of its windows in one batch
+        ranges = [time_info] + [utc_range for utc_range in utc_ranges if utc_range]
+        local_ranges = iter(_convert_ranges(convert_range, ranges))
+        time_info = next(local_ranges)
+        for i, utc_range in enumerate(utc_ranges):
+            if utc_range:
+                upcoming_windows[i] = upcoming_windows[i].replace(utc_range, next(local_ranges))
+
+    if not event_name or not (countdown_seconds > 0 or locations):
+        return None
+
+    return EventTimer(
+        name=event_name,
+        status=status,
+        locations=locations if locations else ["Multiple Locations"],
+        time_info=time_info,
+        countdown_seconds=countdown_seconds,
+        upcoming_windows=upcoming_windows
+    )
+
+
+def extract_events(html_content, convert_range=None):
+    """Extract every event card from a MetaForge page.
+
+    convert_range is applied to each "5:00 AM - 6:00 AM" range (the page
+    shows UTC) and is normally the GUI's local-timezone converter.
+    """
+    root = parse_document(html_content)
+    if root is None:
+        return []
+
+    events = []
+    for card in _xpath(_EVENT_CARDS)(root):
+        try:
+            event = extract_card(card, convert_range)
+        except Exception as e:
+            print(f"Error parsing card: {e}")
+            continue
+        if event is not None:
+            events.append(event)
+    return events
+
+
+def _is_card(element):
+    return element.tag == 'div' and 'bg-secondary/70' in (element.get('class') or '')
+
+
+class CardStream:
+    """Incremental extract_events() for a page that is still downloading.
+
+    feed() takes the next str chunk and returns the events whose cards closed
+    in it, in the order extract_events() would find them. Everything outside
+    an open card is dropped from the tree as soon as it ends, so memory stays
+    flat however long the page is; only the scripts that can carry embedded
+    schedule data are kept, for embedded_source().
+    """
+
+    def __init__(self, convert_range=None):
+        from lxml import etree
+
+        self.convert_range = convert_range
+        self.events = []
+        self._parser = etree.HTMLPullParser(events=('start', 'end'))
+        self._open_cards = 0
+        self._scripts = []
+
+    def feed(self, chunk):
+        """Parse the next chunk and return the events it completed"""
+        self._parser.feed(chunk)
+        return self._drain()
+
+    def close(self):
+        """Finish the document and return the events completed by its tail"""
+        try:
+            self._parser.close()
+        except Exception as e:
+            # A truncated page still yields the cards that did arrive
+            print(f"Error finishing streamed page: {e}")
+        return self._drain()
+
+    def embedded_source(self):
+        """The kept scripts as a page that extract_embedded_events() can read"""
+        return ''.join(self._scripts)
+
+    def _drain(self):
+        completed = []
+        for action, element in self._parser.read_events():
+            if action == 'start':
+                if _is_card(element):
+                    self._open_cards += 1
+                continue
+
+            if _is_card(element):
+                self._open_cards -= 1
+                try:
+                    event = extract_card(element, self.convert_range)
+                except Exception as e:
+                    print(f"Error parsing card: {e}")
+                    event = None
+                if event is not None:
+                    completed.append(event)
+            elif element.tag == 'script':
+                self._keep_script(element)
+
+            # Cards still being built need their children; anything else is done
+            if self._open_cards == 0:
+                element.clear(keep_tail=False)
+                parent = element.getparent()
+                if parent is not None:
+                    while element.getprevious() is not None:
+                        del parent[0]
+        self.events.extend(completed)
+        return completed
+
+    def _keep_script(self, element):
+        text = element.text or ''
+        script_type = element.get('type') or ''
+        if _FLIGHT_PUSH in text:
+            self._scripts.append(f'<script>{text}</script>')
+        elif script_type.endswith('json') and _RAW_HINT.search(text):
+            self._scripts.append(f'<script type="{script_type}">{text}</script>')
+
+
+# ---------------------------------------------------------------------------
+# Embedded data fast path
+#
+# The page is a server-rendered Next.js app, so the schedule usually ships a
+# second time as data: either a <script type="application/json"> blob such as
+# __NEXT_DATA__, or React Server Component "flight" chunks pushed through
+# self.__next_f.push([1, "..."]). Decoding that is far cheaper than building
+# a DOM and does not depend on Tailwind class names.
+# ---------------------------------------------------------------------------
+
+_JSON_SCRIPT = re.compile(r'<script[^>]*type="application/(?:ld\+)?json"[^>]*>([\s\S]*?)</script>')
+_FLIGHT_PUSH = 'self.__next_f.push('
+_FLIGHT_ROW = re.compile(r'([0-9a-zA-Z]+):([\[{][\s\S]*)')
+
+NAME_KEYS = ('name', 'title', 'eventName')
+LOCATIONS_KEYS = ('locations', 'maps')
+WINDOW_LIST_KEYS = ('windows', 'schedule', 'timeSlots', 'slots', 'occurrences', 'times')
+START_KEYS = ('start', 'startTime', 'startsAt', 'start_time', 'from')
+END_KEYS = ('end', 'endTime', 'endsAt', 'end_time', 'to')
+LOCATION_KEYS = ('location', 'map', 'mapName', 'locationName')
+
+# Only decode documents that could plausibly carry a schedule. The leading
+# literal quote keeps the raw-page scan fast; inside flight chunks the closing
+# quote is backslash-escaped.
+_HINT_KEYS = '|'.join(WINDOW_LIST_KEYS + ('countdown',))
+_FLIGHT_HINT = re.compile(f'"(?:{_HINT_KEYS})"')
+_RAW_HINT = re.compile(f'"(?:{_HINT_KEYS})\\\\?"')
+
+
+def _first(record, keys):
+    for key in keys:
+        value = record.get(key)
+        if value not in (None, '', []):
+            return value
+    return None
+
+
+def _to_epoch(value):
+    """Convert an ISO-8601 string or epoch seconds/milliseconds to epoch seconds"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if value.isdigit():
+            value = int(value)
+        else:
+            try:
+                parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            except ValueError:
+                return None
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            return parsed.timestamp()
+    if isinstance(value, (int, float)):
+        # Millisecond timestamps are what JavaScript hands out
+        return value / 1000 if value > 1e11 else float(value)
+    return None
+
+
+def _utc_clock(epoch):
+    """Format epoch seconds as the page does: '5:00 AM' in UTC"""
+    minutes = int(epoch // 60) % (24 * 60)
+    hour, minute = divmod(minutes, 60)
+    return f"{hour % 12 or 12}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+
+def _location_names(value):
+    if isinstance(value, str):
+        return [value]
+    names = []
+    if isinstance(value, list):
+        for item in value:
+            if isinstance(item, dict):
+                item = _first(item, NAME_KEYS)
+            if isinstance(item, str) and item not in names:
+                names.append(item)
+    return names
+
+
+def _is_event_record(item):
+    return (isinstance(item, dict) and _first(item, NAME_KEYS) is not None
+            and (_first(item, WINDOW_LIST_KEYS) is not None or 'countdown' in item))
+
+
+def find_event_records(data):
+    """Depth-first search of decoded JSON for the first list of event-like objects"""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            if node and all(isinstance(item, dict) for item in node):
+                matches = sum(1 for item in node if _is_event_record(item))
+                if matches and matches * 2 >= len(node):
+                    return node
+            stack.extend(reversed(node))
+    return None
+
+
+def _windowed_event(name, record, windows, now, convert_range):
+    """Build an event from absolute start/end windows"""
+    parsed = []
+    for window in windows:
+        if not isinstance(window, dict):
+            continue
+        start = _to_epoch(_first(window, START_KEYS))
+        end = _to_epoch(_first(window, END_KEYS))
+        if start is None or end is None:
+            continue
+        location = _first(window, LOCATION_KEYS)
+        if isinstance(location, dict):
+            location = _first(location, NAME_KEYS)
+        parsed.append((start, end, location if isinstance(location, str) else ""))
+    if not parsed:
+        return None
+    parsed.sort()
+
+    current = next((w for w in parsed if w[0] <= now < w[1]), None)
+    future = [w for w in parsed if w[0] > now]
+    if current is not None:
+        status, shown, countdown = EventStatus.ACTIVE, current, current[1] - now
+    elif future:
+        status, shown, countdown = EventStatus.UPCOMING, future[0], future[0][0] - now
+        future = future[1:]
+    else:
+        return None
+
+    future = future[:MAX_WINDOWS]
+    utc_ranges = [f"{_utc_clock(w[0])} - {_utc_clock(w[1])}" for w in [shown] + future]
+    local_ranges = _convert_ranges(convert_range, utc_ranges) if convert_range else utc_ranges
+
+    # Windows are kept in real time, so with a pinned ``now`` (replays) they
+    # stay in step with the deadline, which is always relative to the present
+    shift = time.time() - now
+    windows = [EventWindow(start + shift, end + shift, location, local_range)
+               for (start, end, location), local_range in zip(future, local_ranges[1:])]
+
+    locations = _location_names(_first(record, LOCATIONS_KEYS))
+    if not locations:
+        locations = [w[2] for w in parsed if w[2]]
+        locations = [loc for i, loc in enumerate(locations) if loc not in locations[:i]]
+
+    return EventTimer(
+        name=name,
+        status=status,
+        locations=locations if locations else ["Multiple Locations"],
+        time_info=local_ranges[0],
+        countdown_seconds=countdown,
+        windows=windows
+    )
+
+
+def event_from_record(record, now=None, convert_range=None):
+    """Map one decoded event object onto an EventTimer.
+
+    Objects carrying absolute start/end windows get their status and
+    countdown derived from ``now``; objects already in the flat API shape
+    (status / countdown / time / windows strings) are taken as-is, as are
+    the events another instance serves through event_server.
+    """
+    name = _first(record, NAME_KEYS)
+    if not isinstance(name, str) or not name.strip():
+        return None
+    name = name.strip()
+    if now is None:
+        now = time.time()
+
+    if 'deadline' in record and 'time_info' in record:
+        # Served by another instance (event_server): already local, absolute deadline
+        return event_from_dict(record, now)
+
+    windows = _first(record, WINDOW_LIST_KEYS)
+    if isinstance(windows, list) and any(isinstance(w, dict) for w in windows):
+        return _windowed_event(name, record, windows, now, convert_range)
+
+    countdown = record.get('countdown', 0)
+    if isinstance(countdown, str):
+        countdown = parse_countdown(countdown)
+    countdown = int(countdown or 0)
+    locations = _location_names(_first(record, LOCATIONS_KEYS))
+    # Same bar as extract_card: a name alone is not an event
+    if not (countdown > 0 or locations):
+        return None
+    return EventTimer(
+        name=name,
+        status=record.get('status', EventStatus.UPCOMING),
+        locations=locations,
+        time_info=record.get('time', ''),
+        countdown_seconds=countdown,
+        upcoming_windows=[w for w in (windows or []) if isinstance(w, str)]
+    )
+
+
+def events_from_data(data, now=None, convert_range=None):
+    """Find and map the event list inside any decoded JSON document.
+
+    Returns an empty list unless most of the records map to usable events:
+    a list that merely looks like events (the right keys, the wrong data)
+    must not win over the rendered cards.
+    """
+    if isinstance(data, dict) and isinstance(data.get('events'), list):
+        records = data['events']
+    else:
+        records = find_event_records(data)
+    if not records:
+        return []
+
+    events = []
+    candidates = 0
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        candidates += 1
+        try:
+            event = event_from_record(record, now, convert_range)
+        except Exception as e:
+            print(f"Error mapping embedded event: {e}")
+            continue
+        if event is not None:
+            events.append(event)
+    if len(events) * 2 <= candidates:
+        return []
+    return events
+
+
+def _flight_text(html_content):
+    """Concatenate the string chunks pushed through self.__next_f"""
+    pushed_args = []
+    pos = html_content.find(_FLIGHT_PUSH)
+    while pos != -1:
+        end = html_content.find('</script>', pos)
+        if end == -1:
+            break
+        arg = html_content[pos + len(_FLIGHT_PUSH):end].rstrip().rstrip(';').rstrip()
+        if arg.endswith(')'):
+            pushed_args.append(arg[:-1])
+        pos = html_content.find(_FLIGHT_PUSH, end)
+    if not pushed_args:
+        return ''
+    try:
+        # One decode for the whole stream instead of one per <script>
+        pushes = json.loads('[' + ','.join(pushed_args) + ']')
+    except ValueError:
+        pushes = []
+        for arg in pushed_args:
+            try:
+                pushes.append(json.loads(arg))
+            except ValueError:
+                continue
+    return ''.join(
+        push[1] for push in pushes
+        if isinstance(push, list) and len(push) > 1 and push[0] == 1 and isinstance(push[1], str)
+    )
+
+
+def _embedded_documents(html_content):
+    """Yield every JSON document embedded in the page that might hold a schedule"""
+    if not _RAW_HINT.search(html_content):
+        return
+
+    for match in _JSON_SCRIPT.finditer(html_content):
+        if not _RAW_HINT.search(match.group(1)):
+            continue
+        try:
+            yield json.loads(match.group(1))
+        except ValueError:
+            continue
+
+    text = _flight_text(html_content)
+    seen_rows = set()
+    for hint in _FLIGHT_HINT.finditer(text):
+        row_start = text.rfind('\n', 0, hint.start()) + 1
+        if row_start in seen_rows:
+            continue
+        seen_rows.add(row_start)
+        row_end = text.find('\n', hint.end())
+        match = _FLIGHT_ROW.match(text, row_start, row_end if row_end != -1 else len(text))
+        if not match:
+            continue
+        try:
+            yield json.loads(match.group(2))
+        except ValueError:
+            continue
+
+
+def extract_embedded_events(html_content, convert_range=None, now=None):
+    """Decode events from the page's hydration payload without building a DOM.
+
+    Returns an empty list when the page carries no recognisable schedule,
+    in which case the caller falls back to extract_events().
+    """
+    if isinstance(html_content, bytes):
+        html_content = html_content.decode('utf-8', errors='replace')
+    for document in _embedded_documents(html_content):
+        events = events_from_data(document, now, convert_range)
+        if events:
+            return events
+    return []
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+ARC Raiders Event Timer - Event Model
+Plain data objects shared by the fetchers, caches and the GUI
+"""
+
+import hashlib
+import math
+import re
+import sys
+import time
+from array import array
+from datetime import datetime
+from enum import Enum
+
+# CLOCK_BOOTTIME keeps counting while the machine is suspended, so countdowns
+# are still right after a laptop wakes up; time.monotonic() would not be.
+if hasattr(time, 'CLOCK_BOOTTIME'):
+    def monotonic_now():
+        return time.clock_gettime(time.CLOCK_BOOTTIME)
+else:
+    monotonic_now = time.monotonic
+
+_HOURS = re.compile(r'(\d+)h')
+_MINUTES = re.compile(r'(\d+)m')
+_SECONDS = re.compile(r'(\d+)s')
+
+# "5:00 AM - 6:00 AM Dam in 3h 38m 42s"; location and countdown are optional
+_WINDOW_TEXT = re.compile(
+    r'^\s*(\d{1,2}:\d{2}\s*[AP]M)\s*-\s*(\d{1,2}:\d{2}\s*[AP]M)\s*(.*?)\s*(?:\bin\s+((?:\d+[hms]\s*)+))?$'
+)
+
+
+def parse_countdown(countdown_text):
+    """Parse countdown text like '3h 42m 26s' or '42m 26s' to seconds"""
+    if not countdown_text:
+        return 0
+
+    text = countdown_text.lower()
+    total = 0
+    for pattern, scale in ((_HOURS, 3600), (_MINUTES, 60), (_SECONDS, 1)):
+        match = pattern.search(text)
+        if match:
+            total += int(match.group(1)) * scale
+    return total
+
+
+def format_countdown(seconds):
+    """Format seconds to '3h 42m 26s' format"""
+    if seconds <= 0:
+        return "0s"
+
+    hours = seconds // 3600
+    minutes = (seconds % 3600) // 60
+    secs = seconds % 60
+
+    parts = []
+    if hours > 0:
+        parts.append(f"{hours}h")
+    if minutes > 0:
+        parts.append(f"{minutes}m")
+    if secs > 0 or not parts:
+        parts.append(f"{secs}s")
+
+    return " ".join(parts)
+
+
+def _clock_minutes(clock):
+    parsed = datetime.strptime(clock.replace(' ', ''), "%I:%M%p")
+    return parsed.hour * 60 + parsed.minute
+
+
+def range_duration(start_clock, end_clock):
+    """Length in seconds of a 'H:MM AM - H:MM PM' range (wrapping past midnight)"""
+    minutes = (_clock_minutes(end_clock) - _clock_minutes(start_clock)) % (24 * 60)
+    return minutes * 60
+
+
+class EventStatus(str, Enum):
+    """Whether an event's window is running; compares equal to the plain strings"""
+    ACTIVE = "Active"
+    UPCOMING = "Upcoming"
+
+    __str__ = str.__str__
+
+    @classmethod
+    def parse(cls, value):
+        """Status from whatever a source sent; anything not active is upcoming"""
+        if isinstance(value, cls):
+            return value
+        return cls.ACTIVE if str(value).strip().lower() == "active" else cls.UPCOMING
+
+
+def _pack_time(value):
+    return math.nan if value is None else value
+
+
+def _unpack_time(value):
+    return None if math.isnan(value) else value
+
+
+class EventWindow:
+    """One upcoming window: wall-clock start/end (Unix time), location and the
+    local 'H:MM AM - H:MM PM' label it is shown with. start and end are None
+    when the source gave no way to place the window in time."""
+
+    __slots__ = ('start', 'end', 'location', 'label')
+
+    def __init__(self, start, end, location, label):
+        self.start = start
+        self.end = end
+        self.location = location
+        self.label = label
+
+    @classmethod
+    def from_text(cls, text, now=None):
+        """Parse a display string like '5:00 AM - 6:00 AM Dam in 3h 38m 42s'; the
+        countdown is taken relative to now. Anything else is kept as the label."""
+        match = _WINDOW_TEXT.match(text)
+        if not match:
+            return cls(None, None, "", text.strip())
+        start_clock, end_clock, location, countdown = match.groups()
+        label = f"{start_clock} - {end_clock}"
+        if countdown is None:
+            return cls(None, None, location, label)
+        if now is None:
+            now = time.time()
+        start = now + parse_countdown(countdown)
+        return cls(start, start + range_duration(start_clock, end_clock), location, label)
+
+    def text(self, now=None):
+        """Display string, counting down to the start as of now"""
+        parts = [self.label]
+        if self.location:
+            parts.append(self.location)
+        if self.start is not None:
+            if now is None:
+                now = time.time()
+            parts.append(f"in {format_countdown(int(math.ceil(max(0.0, self.start - now))))}")
+        return " ".join(parts)
+
+
+class EventTimer:
+    # Windows are packed rather than kept as objects: their start/end times in
+    # one array of doubles (NaN when unknown) and their interned labels and
+    # locations in one tuple. EventWindow records are built on every read of
+    # .windows and not kept, so only the packed form takes up memory.
+    __slots__ = ('name', '_status', 'locations', 'time_info', '_window_times', '_window_labels', 'deadline')
+
+    def __init__(self, name, status, locations, time_info, countdown_seconds, upcoming_windows=(),
+                 deadline=None, windows=None):
+        self.name = name
+        self.status = status  # EventStatus.ACTIVE or EventStatus.UPCOMING
+        self.locations = tuple(locations)
+        self.time_info = time_info  # e.g., "1:00 AM - 2:00 AM"
+        # Display strings are parsed into EventWindow records once, here
+        if windows is None:
+            now = time.time()
+            windows = [EventWindow.from_text(text, now) for text in upcoming_windows]
+        self.windows = windows
+        # Absolute monotonic_now() instant at which the countdown reaches zero
+        if deadline is None:
+            deadline = monotonic_now() + countdown_seconds
+        self.deadline = deadline
+
+    @property
+    def status(self):
+        return self._status
+
+    @status.setter
+    def status(self, value):
+        self._status = EventStatus.parse(value)
+
+    @property
+    def windows(self):
+        """The upcoming windows as EventWindow records, built fresh on each read"""
+        times, labels = self._window_times, self._window_labels
+        return tuple(
+            EventWindow(_unpack_time(times[i]), _unpack_time(times[i + 1]), labels[i + 1], labels[i])
+            for i in range(0, len(times), 2)
+        )
+
+    @windows.setter
+    def windows(self, windows):
+        times = array('d')
+        labels = []
+        for window in windows:
+            times.extend((_pack_time(window.start), _pack_time(window.end)))
+            # The same few labels and locations recur across every event; share them
+            labels.extend((sys.intern(window.label), sys.intern(window.location)))
+        self._window_times = times
+        self._window_labels = tuple(labels)
+
+    @property
+    def window_count(self):
+        """Number of upcoming windows, without building their records"""
+        return len(self._window_times) // 2
+
+    @property
+    def upcoming_windows(self):
+        """The windows as display strings, with countdowns as of now"""
+        now = time.time()
+        return [window.text(now) for window in self.windows]
+
+    def remaining(self, now=None):
+        """Seconds left until the deadline as a float (never negative)"""
+        if now is None:
+            now = monotonic_now()
+        return max(0.0, self.deadline - now)
+
+    @property
+    def countdown_seconds(self):
+        """Whole seconds left, derived from the deadline on every read"""
+        return int(math.ceil(self.remaining()))
+
+    @countdown_seconds.setter
+    def countdown_seconds(self, seconds):
+        self.deadline = monotonic_now() + seconds
+
+
+def event_fingerprint(event):
+    """What a card shows of an event apart from its countdowns"""
+    return (event.name, str(event.status), event.locations, event.time_info or "",
+            # (label, location) pairs straight from the packed labels
+            tuple(zip(event._window_labels[::2], event._window_labels[1::2])))
+
+
+def events_expired(events, now=None):
+    """True once any of the events has counted down to zero"""
+    if now is None:
+        now = monotonic_now()
+    return any(event.deadline <= now for event in events)
+
+
+def schedule_fingerprint(events):
+    """Stable digest of a list of events: names, statuses, locations and window
+    boundaries, in any order. Two fetches of an unchanged schedule give the
+    same fingerprint even though their countdowns differ."""
+    content = repr(sorted(event_fingerprint(event) for event in events))
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+ARC Raiders Event Timer - Local Event Server
+Serves the events one instance has fetched to any number of local clients,
+as JSON with ETags and as a Server-Sent Events stream
+"""
+
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from event_model import schedule_fingerprint
+from metrics import metrics
+from snapshot_cache import events_payload
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+JSON_PATH = "/events.json"
+STREAM_PATH = "/events"
+METRICS_PATH = "/metrics"  # Prometheus text; /metrics.json for JSON
+# Re-fetched events whose deadlines moved less than this are the same schedule
+DEADLINE_TOLERANCE = 5.0
+# Comment lines sent on an idle stream so dead clients are noticed
+KEEPALIVE_INTERVAL = 15.0
+
+
+def parse_address(value, default_host=DEFAULT_HOST, default_port=DEFAULT_PORT):
+    """Turn 'PORT', 'HOST:PORT', 'HOST' or '1' into (host, port)"""
+    value = (value or "").strip()
+    if value in ("", "1"):
+        return default_host, default_port
+    host, _, port = value.rpartition(":")
+    if not host and not port.isdigit():
+        return port, default_port
+    if not port.isdigit():
+        raise ValueError(f"invalid port {port!r} in {value!r}")
+    return host or default_host, int(port)
+
+
+def same_deadlines(old, new, tolerance=DEADLINE_TOLERANCE):
+    """True if two lists of deadlines only differ by countdown drift"""
+    return len(old) == len(new) and all(abs(a - b) <= tolerance for a, b in zip(old, new))
+
+
+class EventRequestHandler(BaseHTTPRequestHandler):
+    server_version = "ArcTimers"
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path in ("/", JSON_PATH):
+            self.send_document()
+        elif path == STREAM_PATH:
+            self.send_stream()
+        elif path == METRICS_PATH:
+            self.send_text(metrics.to_prometheus().encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8")
+        elif path == METRICS_PATH + ".json":
+            self.send_text(metrics.to_json().encode("utf-8"), "application/json; charset=utf-8")
+        else:
+            self.send_error(404)
+
+    def send_document(self):
+        version, etag, body = self.server.event_server.document()
+        if body is None:
+            self.send_error(503, "No events fetched yet")
+            return
+        if etag in self.headers.get("If-None-Match", ""):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_text(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_stream(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        # Clients reconnecting with Last-Event-ID are only sent newer events
+        last_sent = self.headers.get("Last-Event-ID", "")
+        last_sent = int(last_sent) if last_sent.isdigit() else 0
+        try:
+            while True:
+                version, _, body = self.server.event_server.wait_for_change(last_sent, KEEPALIVE_INTERVAL)
+                if version is None:
+                    return  # Server closing
+                if version == last_sent or body is None:
+                    self.wfile.write(b": keepalive\n\n")
+                else:
+                    self.wfile.write(b"event: events\nid: %d\ndata: %s\n\n" % (version, body))
+                    last_sent = version
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+    def log_message(self, format, *args):
+        pass
+
+
+class EventServer:
+    """Publishes the current events on localhost.
+
+    GET /events.json answers with the last published events in the same JSON
+    shape as arc_timers_cli (304 when the ETag matches); GET /events is a
+    Server-Sent Events stream that pushes that document whenever it changes;
+    GET /metrics and /metrics.json dump this process's timings and counters.
+    publish() only produces a new document when the schedule really changed,
+    not on every refresh, so ETags stay valid and streams stay quiet.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.host = host
+        self.port = port
+        self._httpd = None
+        self._thread = None
+        self._fingerprint = None
+        self._deadlines = None
+        self._version = 0
+        self._etag = None
+        self._body = None
+        self._closed = False
+        self._changed = threading.Condition()
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}{JSON_PATH}"
+
+    def start(self):
+        """Bind and serve on a daemon thread; raises OSError if the port is taken"""
+        self._httpd = ThreadingHTTPServer((self.host, self.port), EventRequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.event_server = self
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="event-server", daemon=True)
+        self._thread.start()
+        print(f"Serving events on {self.url} (stream: {STREAM_PATH})")
+        return self
+
+    def publish(self, events, source, now=None):
+        """Make events the served document; returns True if it changed"""
+        fingerprint = schedule_fingerprint(events)
+        payload = events_payload(events, source, now or time.time())
+        deadlines = [event["deadline"] for event in payload["events"]]
+        with self._changed:
+            if fingerprint == self._fingerprint and same_deadlines(self._deadlines, deadlines):
+                return False
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self._fingerprint = fingerprint
+            self._deadlines = deadlines
+            self._version += 1
+            self._etag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+            self._body = body
+            self._changed.notify_all()
+        return True
+
+    def document(self):
+        """(version, ETag, body) of the current document; body is None before the first publish"""
+        with self._changed:
+            return self._version, self._etag, self._body
+
+    def wait_for_change(self, version, timeout):
+        """Block until the document is newer than version or timeout passes.
+
+        Returns document(), or (None, None, None) once the server is closing.
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self._closed or self._version != version, timeout)
+            if self._closed:
+                return None, None, None
+            return self._version, self._etag, self._body
+
+    def close(self):
+        with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+ARC Raiders Event Timer - Event Service
+Fetch, parse and timezone logic shared by the GUI and the headless CLI
+"""
+
+import asyncio
+from datetime import datetime, timezone
+import json
+import os
+import queue
+import time
+
+from debug_capture import DebugCapture
+from event_model import events_expired
+from event_extractor import CardStream, events_from_data, extract_embedded_events, extract_events, format_countdown
+from fetch_engine import FetchCoordinator, FetchEngine, FetchLoop, FetchSource
+from http_client import HttpClient, RetryLater
+from metrics import metrics
+from schedule_projection import ScheduleProjection
+from shared_cache import SharedFetchCache
+from snapshot_cache import save_snapshot
+from time_conversion import LocalTimeConverter
+
+# Debug capture of every fetched response; also switchable at runtime
+# (EventService.capture.enabled, Ctrl+D in the GUI, --capture in the CLI)
+DEBUG_MODE = os.environ.get("ARC_TIMERS_DEBUG", "") not in ("", "0")
+
+# Serve fetched events to other local clients (event_server): "1", PORT or HOST:PORT
+SERVE_ADDRESS = os.environ.get("ARC_TIMERS_SERVE", "")
+# Another instance's /events.json; tried first, MetaForge is only raced if it fails
+UPSTREAM_URL = os.environ.get("ARC_TIMERS_UPSTREAM", "")
+
+# Candidate MetaForge API endpoints, raced alongside the HTML scrape
+API_URLS = [
+    "https://metaforge.app/api/arc-raiders/event-timers",
+    "https://metaforge.app/api/events/arc-raiders",
+    "https://api.metaforge.app/arc-raiders/event-timers",
+]
+SCRAPE_URL = "https://metaforge.app/arc-raiders/event-timers"
+# The page is parsed as it downloads, this much at a time
+STREAM_CHUNK_SIZE = 16 * 1024
+
+
+class EventService:
+    """Everything needed to get events off MetaForge, without any UI.
+
+    Neither tkinter nor PIL is imported here, so the headless CLI can use
+    this on machines without a display.
+    """
+
+    def __init__(self, serve_address=None):
+        # Get user's local timezone
+        self.local_tz = self.get_local_timezone()
+        print(f"User timezone: {self.local_tz}")
+        
+        # Memoized UTC -> local conversion; follows the system's DST rules
+        # rather than the fixed offset in local_tz, which is only for display
+        self.time_converter = LocalTimeConverter()
+        
+        # One pooled keep-alive session shared by every fetch
+        self.http = HttpClient()
+        
+        # All sources are raced; the last winner gets a head start next time
+        api_urls = ([UPSTREAM_URL] if UPSTREAM_URL else []) + API_URLS
+        sources = [
+            FetchSource(api_url, lambda cancel, on_event, api_url=api_url: self.fetch_events_from_api(api_url, cancel))
+            for api_url in api_urls
+        ]
+        sources.append(FetchSource("html", self.scrape_events))
+        self.fetch_engine = FetchEngine(sources)
+        if UPSTREAM_URL:
+            # The head start usually means MetaForge is never contacted
+            self.fetch_engine.preferred_source = UPSTREAM_URL
+        
+        # Every fetch runs on one long-lived asyncio loop thread, one at a
+        # time; concurrent callers share it. Refreshes requested with
+        # request_refresh() report back through ``results``
+        self.fetch_loop = FetchLoop(workers=len(sources) + 2)
+        self.fetches = FetchCoordinator(self._fetch_generation)
+        self.results = queue.Queue()
+        self._refresh = None
+        self._streaming = False
+        
+        # The snapshot doubles as a fetch cache shared with other instances
+        self.shared_cache = SharedFetchCache()
+        
+        # Rotation learned from past fetches; rolls events over without the network
+        self.projection = ScheduleProjection(self.time_converter)
+        self.last_source = None
+        
+        # Off unless DEBUG_MODE; written on a background thread into the cache dir
+        self.capture = DebugCapture(enabled=DEBUG_MODE)
+        
+        # Local JSON / SSE endpoint for other instances and overlays; an
+        # explicit serve_address (the CLI's --serve) wins over ARC_TIMERS_SERVE
+        self.server = None
+        serve_address = serve_address or SERVE_ADDRESS
+        if serve_address:
+            self.serve(serve_address)
+    
+    def get_local_timezone(self):
+        """Get the user's local timezone"""
+        try:
+            # Try to get local timezone
+            local_tz_name = datetime.now(timezone.utc).astimezone().tzname()
+            # Get the timezone object
+            return datetime.now().astimezone().tzinfo
+        except Exception as e:
+            print(f"Could not detect timezone: {e}, using system local time")
+            return None
+    
+    def convert_utc_time_to_local(self, time_str):
+        """Convert UTC time string like '5:00 AM' to local timezone"""
+        return self.time_converter.convert_time(time_str)
+    
+    def convert_time_range_to_local(self, time_range):
+        """Convert UTC time range like '5:00 AM - 6:00 AM' to local timezone"""
+        return self.time_converter(time_range)
+    
+    def fetch_events_from_api(self, api_url, cancel=None):
+        """Try to fetch events from a single MetaForge API endpoint"""
+        headers = {
+            'User-Agent': 'ArcTimersApp/1.0',
+            'Accept': 'application/json',
+        }
+        
+        try:
+            return self.http.fetch_parsed(
+                api_url,
+                lambda response: self.parse_api_response(response, api_url),
+                headers=headers,
+                timeout=10,
+                cancel=cancel,
+                # Statuses and countdowns are parsed relative to now, so a 304
+                # must not hand back events that have since rolled over
+                reusable=lambda events: not events_expired(events)
+            )
+        except RetryLater:
+            raise  # The fetch engine backs off from this source
+        except Exception as e:
+            print(f"API fetch failed for {api_url}: {e}")
+            return None
+    
+    def parse_api_response(self, response, api_url, now=None):
+        """Parse an API response, capturing it (even when unusable) if enabled"""
+        events = None
+        try:
+            events = self.parse_api_data(response.json(), now)
+            return events
+        finally:
+            self.capture.capture(api_url, api_url, response.text, events, "application/json", now)
+    
+    def parse_api_data(self, data, now=None):
+        """Parse event data from API response (``now`` pins the clock for replays)"""
+        with metrics.span("parse", kind="api"):
+            events = events_from_data(data, now, self.time_converter)
+        return events if events else None
+    
+    def fetch_events(self):
+        """Fetch events from whichever MetaForge source answers first (None on failure).
+
+        Blocks the calling thread while the fetch runs on the fetch loop; if
+        a fetch is already in flight, its result is shared instead. Fresh
+        events have already been stored when this returns.
+        """
+        snapshot = self.fetch_loop.run(self.fetches.get())
+        if snapshot.events:
+            self.last_source = snapshot.source
+            return list(snapshot.events)
+        return None
+    
+    async def fetch_shared(self, on_event=None, force=False):
+        """(events, source) from the shared cache if another instance just fetched, else from the network.
+
+        Only one process on the machine goes to the network for an expired
+        entry; the others wait on the lock and then read what it stored.
+        force (a refresh the user asked for) skips the cache and races sources
+        that are backing off too (see FetchEngine.race); it still takes the
+        lock so waiting instances get its result.
+        """
+        loop = asyncio.get_running_loop()
+        async with self.shared_cache.refresh_lock(self.fetch_engine.timeout) as locked:
+            if not locked:
+                print("Fetch lock unavailable; fetching without it")
+            cached = None if force else await loop.run_in_executor(None, self.shared_cache.fresh)
+            if cached is not None:
+                events, source = cached
+                metrics.incr("cache_hits", cache="shared")
+                print(f"Using {len(events)} events from the shared cache (fetched from {source})")
+                # Already checked against the projection by whoever fetched it;
+                # confirming the same snapshot again would count it twice
+                await loop.run_in_executor(None, self.projection.observe, events)
+                return events, f"shared:{source}"
+            
+            events, source = await self.fetch_engine.race(on_event, force)
+            if events:
+                # Still under the lock, so waiting instances find these
+                await loop.run_in_executor(None, self.store_events, events, source)
+            return events, source
+    
+    def request_refresh(self, force=False):
+        """Start a fetch in the background; its result arrives on ``results``.
+
+        Progress is put on ``results`` as (kind, generation, payload) tuples:
+        ("event", generation, EventTimer) for every card streamed in, then
+        exactly one ("done", generation, FetchSnapshot). Fresh events have
+        already been stored by then. A request while a refresh is pending
+        joins it, as does one made while another caller's fetch is in flight.
+        force (a refresh the user asked for) also tries sources in backoff.
+        """
+        if self._refresh is None or self._refresh.done():
+            self._refresh = self.fetch_loop.submit(self._run_refresh(force))
+    
+    async def _run_refresh(self, force):
+        self._streaming = True
+        try:
+            snapshot = await self.fetches.get(force)
+        finally:
+            self._streaming = False
+        self.results.put(("done", snapshot.generation, snapshot))
+    
+    async def _fetch_generation(self, generation, force):
+        def on_event(event):
+            # Partial events are only wanted while a refresh is waiting on ``results``
+            if self._streaming:
+                self.results.put(("event", generation, event))
+        return await self.fetch_shared(on_event, force)
+    
+    def scrape_events(self, cancel=None, on_event=None):
+        """Scrape events from the MetaForge website"""
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9',
+        }
+        
+        try:
+            print("Fetching events from MetaForge website...")
+            return self.http.fetch_parsed(
+                SCRAPE_URL,
+                lambda response: self.parse_html_stream(response, on_event, cancel),
+                headers=headers,
+                timeout=15,
+                cancel=cancel,
+                stream=True,
+                reusable=lambda events: not events_expired(events)
+            )
+        except RetryLater:
+            raise  # The fetch engine backs off from this source
+        except Exception as e:
+            print(f"ERROR fetching events: {e}")
+            if DEBUG_MODE:
+                import traceback
+                traceback.print_exc()
+            return None
+    
+    def parse_html_response(self, response, now=None):
+        """Parse event cards out of a MetaForge event-timers page (``now`` pins the clock for replays)"""
+        html_content = response.text
+        events = None
+        try:
+            events = self.parse_html(html_content, now)
+            return events
+        finally:
+            self.capture.capture("html", getattr(response, 'url', SCRAPE_URL), html_content, events, "text/html", now)
+    
+    def parse_html_stream(self, response, on_event=None, cancel=None, now=None):
+        """Parse a MetaForge page while it downloads, reporting each card as it closes.
+
+        Embedded page data still wins over the cards once the whole page is
+        in, exactly as in parse_html(). The body is only kept in memory when
+        it has to be captured.
+        """
+        stream = CardStream(self.time_converter)
+        body = [] if self.capture.enabled else None
+        events = None
+        # Only the time spent parsing is counted, not waiting for the network
+        parse_time = 0.0
+        try:
+            print("Parsing event cards from HTML as it arrives...")
+            if not response.encoding:
+                # No charset in the headers; MetaForge serves UTF-8
+                response.encoding = 'utf-8'
+            for chunk in response.iter_content(STREAM_CHUNK_SIZE, decode_unicode=True):
+                if cancel is not None and cancel.is_set():
+                    return None
+                if body is not None:
+                    body.append(chunk)
+                started = time.perf_counter()
+                parsed = stream.feed(chunk)
+                parse_time += time.perf_counter() - started
+                for event in parsed:
+                    if on_event:
+                        on_event(event)
+            started = time.perf_counter()
+            parsed = stream.close()
+            parse_time += time.perf_counter() - started
+            for event in parsed:
+                if on_event:
+                    on_event(event)
+            
+            started = time.perf_counter()
+            events = extract_embedded_events(stream.embedded_source(), self.time_converter, now=now)
+            metrics.observe("parse", parse_time + time.perf_counter() - started, kind="html-stream")
+            if events:
+                print(f"Parsed {len(events)} events from embedded page data")
+            else:
+                events = stream.events
+            events = self.report_parsed(events)
+            return events
+        finally:
+            if body is not None:
+                self.capture.capture("html", getattr(response, 'url', SCRAPE_URL), ''.join(body), events, "text/html", now)
+    
+    def parse_html(self, html_content, now=None):
+        """Parse events out of the page source, embedded data first"""
+        with metrics.span("parse", kind="html"):
+            # Fast path: decode the page's embedded schedule data, no DOM needed
+            events = extract_embedded_events(html_content, self.time_converter, now=now)
+            if events:
+                print(f"Parsed {len(events)} events from embedded page data")
+            else:
+                print("Parsing event cards from HTML...")
+                events = extract_events(html_content, self.time_converter)
+        return self.report_parsed(events)
+    
+    def report_parsed(self, events):
+        """Log what was parsed from the website; returns events, or None if there are none"""
+        for event in events:
+            print(f"✓ Parsed: {event.name} - {event.status} - {format_countdown(event.countdown_seconds)}")
+        
+        if events:
+            print(f"\n✓ Successfully parsed {len(events)} events from website")
+            return events
+        else:
+            print("ERROR: No events parsed from website")
+            return None
+    
+    def store_events(self, events, source=None):
+        """Persist freshly fetched events and teach them to the projection"""
+        save_snapshot(events, source=source)
+        self.learn_events(events)
+    
+    def learn_events(self, events):
+        """Check freshly fetched events against the projection, then teach them to it"""
+        # Check the projection against the site before learning from it
+        self.projection.confirm(events)
+        self.projection.observe(events)
+    
+    def retry_delay(self):
+        """Seconds until a failed refresh is worth retrying, given every source's backoff"""
+        return self.fetch_engine.retry_delay()
+    
+    def project_events(self, names=None):
+        """Events projected from the learned rotation, or None if it cannot cover them all"""
+        names = names or self.projection.event_names()
+        return self.projection.project(names) if names else None
+    
+    def serve(self, address=None):
+        """Start the local event server on address ('PORT' or 'HOST:PORT'); False if it cannot bind"""
+        if self.server is not None:
+            return True
+        from event_server import EventServer, parse_address
+        try:
+            self.server = EventServer(*parse_address(address)).start()
+        except (OSError, ValueError) as e:
+            print(f"Could not start event server on {address}: {e}")
+            return False
+        return True
+    
+    def publish(self, events, source):
+        """Hand the events now on display to the local event server, if it runs"""
+        if self.server is not None and events:
+            self.server.publish(events, source)
+    
+    def replay_capture(self, record):
+        """Parse a debug capture again, as of the moment it was captured"""
+        capture_enabled, self.capture.enabled = self.capture.enabled, False
+        try:
+            if "json" in record["content_type"]:
+                events = self.parse_api_data(json.loads(record["body"]), now=record["captured_at"])
+            else:
+                events = self.parse_html(record["body"], now=record["captured_at"])
+        finally:
+            self.capture.enabled = capture_enabled
+        return events
+    
+    def close(self):
+        if self.server is not None:
+            self.server.close()
+        self.fetch_loop.close()
+        self.http.close()
+        self.capture.close()
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+ARC Raiders Event Timer - Fetch Engine
+Races every candidate event source concurrently and keeps the first valid result
+"""
+
+import asyncio
+import concurrent.futures
+import queue
+import threading
+import time
+from collections import namedtuple
+
+from http_client import RetryLater
+from metrics import metrics
+from source_health import SourceHealth
+
+# The result of one fetch. Never modified once made: events is a tuple
+# (empty if every source failed) and generation numbers fetches in the order
+# they were started, so a consumer can tell a stale result from a newer one.
+FetchSnapshot = namedtuple("FetchSnapshot", "generation events source fetched_at")
+
+
+class FetchSource:
+    """A named source of events (an API endpoint or the HTML scrape)"""
+
+    def __init__(self, name, fetch):
+        self.name = name
+        # Callable taking a cancel event and an on_event callback (or None) and
+        # returning a list of EventTimer or None. Sources that parse as they
+        # download pass each event to on_event as soon as it is ready.
+        self.fetch = fetch
+
+
+class DaemonThreadPool(concurrent.futures.ThreadPoolExecutor):
+    """Bounded thread pool whose workers are daemon threads.
+
+    ThreadPoolExecutor's workers are joined when the interpreter exits, so a
+    source blocked in requests would keep the process alive after the window
+    has closed. This pool starts up to max_workers daemon threads on demand
+    and reuses idle ones. It subclasses ThreadPoolExecutor only because
+    asyncio insists on one for the default executor; none of its internals
+    are used.
+    """
+
+    def __init__(self, max_workers, thread_name_prefix="pool"):
+        self._max_workers = max_workers
+        self._thread_name_prefix = thread_name_prefix
+        self._work = queue.SimpleQueue()
+        self._idle = threading.Semaphore(0)
+        self._threads = []
+        self._shutdown = False
+        self._lock = threading.Lock()
+
+    def submit(self, fn, /, *args, **kwargs):
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            future = concurrent.futures.Future()
+            self._work.put((future, fn, args, kwargs))
+            if not self._idle.acquire(blocking=False) and len(self._threads) < self._max_workers:
+                thread = threading.Thread(target=self._worker, daemon=True,
+                                          name=f"{self._thread_name_prefix}_{len(self._threads)}")
+                self._threads.append(thread)
+                thread.start()
+        return future
+
+    def _worker(self):
+        while True:
+            item = self._work.get()
+            if item is None:
+                return
+            future, fn, args, kwargs = item
+            del item
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+            del future, fn, args, kwargs
+            self._idle.release()
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        with self._lock:
+            self._shutdown = True
+            if cancel_futures:
+                while True:
+                    try:
+                        item = self._work.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is not None:
+                        item[0].cancel()
+            threads = list(self._threads)
+            for _ in threads:
+                self._work.put(None)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+
+class FetchLoop:
+    """One long-lived asyncio loop on a daemon thread for all network work.
+
+    The loop and its worker pool are only started by the first submit(), so
+    offline code paths never create them. The sources block (requests,
+    lxml), so they run in the loop's bounded default executor, whose daemon
+    threads are reused from one refresh to the next and never hold up exit.
+    """
+
+    def __init__(self, workers=8):
+        self.workers = workers
+        self._loop = None
+        self._thread = None
+        self._executor = None
+        self._futures = set()
+        self._lock = threading.Lock()
+
+    def _start(self):
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._executor = DaemonThreadPool(self.workers, thread_name_prefix="fetch")
+            self._loop.set_default_executor(self._executor)
+            self._thread = threading.Thread(target=self._run, name="fetch-loop", daemon=True)
+            self._thread.start()
+        return self._loop
+
+    def _run(self):
+        loop = self._loop
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+            # Stopped by close(): let cancelled coroutines unwind their finally blocks
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        finally:
+            loop.close()
+
+    def submit(self, coroutine):
+        """Schedule coroutine on the loop; returns a concurrent.futures.Future"""
+        with self._lock:
+            future = asyncio.run_coroutine_threadsafe(coroutine, self._start())
+            self._futures.add(future)
+        future.add_done_callback(self._futures.discard)
+        return future
+
+    def run(self, coroutine, timeout=None):
+        """Run coroutine on the loop and wait for its result from another thread"""
+        return self.submit(coroutine).result(timeout)
+
+    def close(self, timeout=2.0):
+        """Cancel everything in flight and stop the loop"""
+        with self._lock:
+            loop, self._loop = self._loop, None
+            thread, executor = self._thread, self._executor
+            futures = list(self._futures)
+        if loop is None:
+            return
+        for future in futures:
+            future.cancel()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        # Sources check their cancel event between chunks; don't wait for them
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class FetchEngine:
+    """Fire all sources at once and return the first one that yields events.
+
+    The source that won the previous race is started first and given a short
+    head start; if it answers within ``hedge_delay`` the other sources are
+    never contacted at all. Sources that have been failing are left out of
+    the race until their backoff (see source_health) has expired.
+    """
+
+    def __init__(self, sources, hedge_delay=1.5, timeout=20):
+        self.sources = list(sources)
+        self.hedge_delay = hedge_delay
+        self.timeout = timeout
+        self.preferred_source = None
+        self.health = {source.name: SourceHealth(source.name) for source in self.sources}
+        self._lock = threading.Lock()
+
+    def ordered_sources(self):
+        """Return the sources with last race's winner first"""
+        with self._lock:
+            preferred = self.preferred_source
+        return sorted(self.sources, key=lambda source: source.name != preferred)
+
+    def retry_delay(self, now=None):
+        """Seconds until at least one source may be tried again (0 if one may be now)"""
+        if now is None:
+            now = time.monotonic()
+        return min((health.wait_time(now) for health in self.health.values()), default=0.0)
+
+    async def race(self, on_event=None, force=False):
+        """Race all sources, returning (events, source_name) or (None, None).
+
+        on_event receives partial events from streaming sources until the race
+        has been decided; after that, losers' stragglers are dropped. If the
+        race itself is cancelled, every source is told to give up. With force
+        (a refresh the user asked for) sources in backoff are raced as well.
+        """
+        now = time.monotonic()
+        sources = [source for source in self.ordered_sources()
+                   if force or self.health[source.name].available(now)]
+        if not sources:
+            if self.sources:
+                print(f"All event sources are backing off; next attempt in {self.retry_delay(now):.0f}s")
+            return None, None
+
+        loop = asyncio.get_running_loop()
+        cancel = threading.Event()
+        deadline = loop.time() + self.timeout
+        pending = {}
+
+        def partial(event):
+            if not cancel.is_set():
+                on_event(event)
+
+        def start(source):
+            future = loop.run_in_executor(None, self._run, source, cancel, partial if on_event else None)
+            pending[future] = source
+
+        try:
+            waiting = list(sources)
+
+            # Give the last winner a head start before hitting everything else
+            if waiting[0].name == self.preferred_source and len(waiting) > 1:
+                start(waiting.pop(0))
+                result = await self._next_result(pending, min(self.hedge_delay, self.timeout))
+                if result is not None and result[1]:
+                    return self._finish(result)
+
+            for source in waiting:
+                start(source)
+
+            while pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                result = await self._next_result(pending, remaining)
+                if result is None:
+                    break
+                if result[1]:
+                    return self._finish(result)
+
+            # Sources still running at the deadline count as failed too
+            for source in pending.values():
+                self.health[source.name].record_failure(breaker=self._breaker_allowed(source))
+            print("All event sources failed")
+            return None, None
+        finally:
+            # Tell any stragglers to give up
+            cancel.set()
+            for future in pending:
+                future.cancel()
+
+    def _breaker_allowed(self, source):
+        """Only cut a source off for the breaker cooldown while another source is working.
+
+        When everything fails at once (the network is down) or the source is
+        the only one left, it keeps plain exponential backoff instead, so the
+        app notices quickly when the site comes back.
+        """
+        return any(health.failures == 0 for name, health in self.health.items() if name != source.name)
+
+    def _run(self, source, cancel, on_event):
+        if cancel.is_set():
+            return None
+        health = self.health[source.name]
+        breaker = self._breaker_allowed(source)
+        try:
+            with metrics.span("source", source=source.name):
+                events = source.fetch(cancel, on_event)
+        except RetryLater as e:
+            delay = health.record_failure(e.retry_after, breaker=breaker)
+            metrics.incr("source_failures", source=source.name)
+            print(f"Source {source.name} asked us to back off: {e}; not trying it for {delay:.0f}s")
+            return None
+        except Exception as e:
+            print(f"Source {source.name} failed: {e}")
+            health.record_failure(breaker=breaker)
+            metrics.incr("source_failures", source=source.name)
+            return None
+        if events:
+            health.record_success()
+        elif not cancel.is_set():
+            # Losers cut short by the race are not failures
+            health.record_failure(breaker=breaker)
+            metrics.incr("source_failures", source=source.name)
+        return events
+
+    async def _next_result(self, pending, timeout):
+        """Wait for one source to finish; returns (source, events) or None on timeout"""
+        done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        if not done:
+            return None
+        future = done.pop()
+        return pending.pop(future), future.result()
+
+    def _finish(self, result):
+        source, events = result
+        with self._lock:
+            self.preferred_source = source.name
+        print(f"Fetched {len(events)} events from {source.name}")
+        return events, source.name
+
+
+class FetchCoordinator:
+    """Single-flight fetching: at most one fetch runs at a time.
+
+    Callers that arrive while a fetch is in flight wait for that fetch and
+    share its FetchSnapshot instead of starting another. Only used from the
+    fetch loop's thread (submit coroutines that await get()).
+    """
+
+    def __init__(self, fetch):
+        # Coroutine function taking the generation number and a force flag
+        # (see FetchEngine.race) and returning (events, source)
+        self.fetch = fetch
+        self.generation = 0
+        self.latest = None  # Last snapshot made
+        self._inflight = None
+
+    async def get(self, force=False):
+        """The snapshot of the fetch in flight, starting one if there is none"""
+        if self._inflight is None:
+            self.generation += 1
+            self._inflight = asyncio.ensure_future(self._run(self.generation, force))
+        # One caller giving up must not cancel the fetch for the others
+        return await asyncio.shield(self._inflight)
+
+    async def _run(self, generation, force):
+        events = source = None
+        try:
+            with metrics.span("fetch"):
+                events, source = await self.fetch(generation, force)
+        except Exception as e:
+            print(f"Fetch failed: {e}")
+        finally:
+            self._inflight = None
+        snapshot = FetchSnapshot(generation, tuple(events or ()), source if events else None, time.time())
+        self.latest = snapshot
+        return snapshot
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+ARC Raiders Event Timer - HTTP Client
+Long-lived pooled session with conditional GET support for MetaForge fetches
+"""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from metrics import metrics
+
+# Statuses with which a server asks to be left alone for a while
+RETRY_LATER_STATUSES = (429, 503)
+
+
+class RetryLater(Exception):
+    """The server is rate limiting us or unavailable (429/503)"""
+
+    def __init__(self, url, status, retry_after=None):
+        super().__init__(f"{url} answered {status}" +
+                         (f", retry after {retry_after:.0f}s" if retry_after is not None else ""))
+        self.url = url
+        self.status = status
+        # Seconds the server asked us to wait (Retry-After), or None
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value, now=None):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if now is None:
+        now = time.time()
+    return max(0.0, when.timestamp() - now)
+
+
+class CachedResponse:
+    """Validators and parsed value from the last successful response for a URL"""
+
+    def __init__(self, etag, last_modified, value):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.value = value
+
+
+class HttpClient:
+    """Shared keep-alive session that revalidates instead of re-downloading.
+
+    Every successful response remembers its ETag / Last-Modified validators
+    together with the value parsed from it. The next request for the same URL
+    is sent conditionally and a 304 answer returns the remembered value
+    without touching the parser. A value that depends on the time it was
+    parsed at can be dropped once it is out of date (see fetch_parsed). The session (and requests itself) is only
+    created by the first request, so offline code paths never import it.
+    """
+
+    def __init__(self, pool_size=8):
+        self.pool_size = pool_size
+        self._session = None
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util import make_headers
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                # Advertise every content coding urllib3 can decode (gzip, deflate, br, zstd)
+                session.headers.update(make_headers(keep_alive=True, accept_encoding=True))
+                self._session = session
+            return self._session
+
+    def get(self, url, headers=None, timeout=10, **kwargs):
+        """Plain pooled GET"""
+        return self.session.get(url, headers=headers, timeout=timeout, **kwargs)
+
+    def fetch_parsed(self, url, parse, headers=None, timeout=10, cancel=None, stream=False, reusable=None):
+        """Conditionally GET url and return parse(response), or the cached value on 304.
+
+        parse may return None to signal an unusable body; such responses are
+        not cached so the next request downloads the full page again. If
+        reusable(value) says the cached value is out of date, it is dropped
+        and the body downloaded and parsed again, even if unchanged. With
+        stream, parse is handed the response before the body has been read
+        and consumes it through iter_content(). Raises RetryLater on 429 and
+        503, carrying the server's Retry-After.
+        """
+        request_headers = dict(headers or {})
+        with self._lock:
+            cached = self._cache.get(url)
+            if cached is not None and reusable is not None and not reusable(cached.value):
+                del self._cache[url]
+                cached = None
+        if cached is not None:
+            if cached.etag:
+                request_headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                request_headers['If-Modified-Since'] = cached.last_modified
+
+        response = self.get(url, headers=request_headers, timeout=timeout, stream=stream)
+        try:
+            if response.status_code == 304 and cached is not None:
+                print(f"Not modified: {url}")
+                metrics.incr("cache_hits", cache="http")
+                return cached.value
+
+            if response.status_code in RETRY_LATER_STATUSES:
+                raise RetryLater(url, response.status_code, parse_retry_after(response.headers.get('Retry-After')))
+            response.raise_for_status()
+            if cancel is not None and cancel.is_set():
+                return None
+
+            value = parse(response)
+        finally:
+            # Bytes off the wire, before decompression; counted before close() drops them
+            tell = getattr(response.raw, 'tell', None)
+            if tell is not None:
+                metrics.incr("bytes_downloaded", tell())
+            # Releases a streamed connection even if parse stopped reading early
+            response.close()
+
+        if value:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            with self._lock:
+                if etag or last_modified:
+                    self._cache[url] = CachedResponse(etag, last_modified, value)
+                else:
+                    self._cache.pop(url, None)
+        return value
+
+    def close(self):
+        """Close pooled connections"""
+        with self._lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+ARC Raiders Event Timer - Metrics
+Timing spans and counters for the hot paths, dumped as Prometheus text or JSON
+"""
+
+import collections
+import contextlib
+import json
+import math
+import os
+import threading
+import time
+
+# Recent durations kept per span; percentiles are computed over these
+RING_SIZE = 512
+PERCENTILES = (0.5, 0.95, 0.99)
+PREFIX = "arc_timers"
+
+
+def _percentile(ordered, fraction):
+    # Nearest rank
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(labels, extra=()):
+    pairs = tuple(labels) + tuple(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+class SpanStats:
+    """Count, total and a ring buffer of the latest durations of one span"""
+
+    __slots__ = ('count', 'total', 'recent')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.recent = collections.deque(maxlen=RING_SIZE)
+
+
+class Metrics:
+    """In-process registry of timing spans and counters.
+
+    Recording is cheap enough for every countdown tick: one perf_counter()
+    pair, a deque append and a couple of additions under a lock. Series are
+    keyed by name plus optional labels (e.g. the source of a fetch), and
+    nothing is aggregated until a dump is asked for.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._spans = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, name, **labels):
+        """Time the block as one sample of span ``name``"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def observe(self, name, seconds, **labels):
+        """Record a duration measured elsewhere"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            stats = self._spans.get(key)
+            if stats is None:
+                stats = self._spans[key] = SpanStats()
+            stats.count += 1
+            stats.total += seconds
+            stats.recent.append(seconds)
+
+    def incr(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def snapshot(self):
+        """Everything recorded so far as JSON-ready data"""
+        with self._lock:
+            spans = [(key, stats.count, stats.total, sorted(stats.recent)) for key, stats in self._spans.items()]
+            counters = list(self._counters.items())
+        data = {"uptime": time.time() - self.started_at, "spans": [], "counters": []}
+        for (name, labels), count, total, ordered in sorted(spans):
+            entry = {"name": name, "labels": dict(labels), "count": count, "sum": total,
+                     "max": ordered[-1] if ordered else 0.0}
+            for fraction in PERCENTILES:
+                entry[f"p{int(fraction * 100)}"] = _percentile(ordered, fraction) if ordered else 0.0
+            data["spans"].append(entry)
+        for (name, labels), value in sorted(counters):
+            data["counters"].append({"name": name, "labels": dict(labels), "value": value})
+        return data
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self):
+        """Prometheus text exposition: spans as summaries (seconds), counters as totals"""
+        data = self.snapshot()
+        lines = [f"# TYPE {PREFIX}_uptime_seconds gauge", f"{PREFIX}_uptime_seconds {data['uptime']:.3f}"]
+        metric = f"{PREFIX}_span_seconds"
+        if data["spans"]:
+            lines.append(f"# TYPE {metric} summary")
+        for entry in data["spans"]:
+            labels = (("span", entry["name"]),) + tuple(entry["labels"].items())
+            for fraction in PERCENTILES:
+                value = entry[f"p{int(fraction * 100)}"]
+                lines.append(f"{metric}{_label_text(labels, (('quantile', fraction),))} {value:.6f}")
+            lines.append(f"{metric}_sum{_label_text(labels)} {entry['sum']:.6f}")
+            lines.append(f"{metric}_count{_label_text(labels)} {entry['count']}")
+        for name in sorted({entry["name"] for entry in data["counters"]}):
+            lines.append(f"# TYPE {PREFIX}_{name}_total counter")
+            for entry in data["counters"]:
+                if entry["name"] == name:
+                    lines.append(f"{PREFIX}_{name}_total{_label_text(entry['labels'].items())} {entry['value']}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        """Short plain-text table of the spans (in ms) and counters, for the stats panel"""
+        data = self.snapshot()
+        lines = [f"{'span':<28}{'n':>7}{'p50':>9}{'p95':>9}{'max':>9}"]
+        for entry in data["spans"]:
+            name = entry["name"] + "".join(f" {value}" for value in entry["labels"].values())
+            if len(name) > 27:
+                name = "..." + name[-24:]
+            lines.append(f"{name:<28}{entry['count']:>7}" + "".join(
+                f"{entry[column] * 1000:>9.2f}" for column in ("p50", "p95", "max")))
+        if data["counters"]:
+            lines.append("")
+        for entry in data["counters"]:
+            name = entry["name"] + "".join(f" {value}" for value in entry["labels"].values())
+            lines.append(f"{name:<44}{entry['value']:>18}")
+        return "\n".join(lines)
+
+    def write_dump(self, path):
+        """Atomically write a dump: Prometheus text for *.prom, JSON otherwise"""
+        text = self.to_prometheus() if path.endswith(".prom") else self.to_json() + "\n"
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+
+# The process-wide registry every module records into
+metrics = Metrics()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+ARC Raiders Event Timer - Refresh Scheduler
+Plans one fetch per status transition instead of polling every second
+"""
+
+import heapq
+import random
+
+from event_model import monotonic_now
+
+
+class RefreshScheduler:
+    """Decide when the next network refresh should happen.
+
+    Upcoming event deadlines (all on the monotonic_now() clock) are kept in
+    a priority queue. The next fetch is planned just after the earliest
+    transition, once the site has had a moment to roll over, and every other
+    deadline falling within ``coalesce_window`` of it is folded into that same
+    fetch. With nothing due soon the schedule falls back to a slow periodic
+    revalidation, counted from the last fetch, so schedule changes are still
+    picked up. While a confirmed local projection is rolling the events over
+    the revalidation stretches to ``projected_revalidate_interval``.
+
+    An event still at zero after a fetch means the site has not rolled it
+    over yet; that is retried after ``retry_interval``, doubling with every
+    further fetch that still shows it, up to ``revalidate_interval``.
+    """
+
+    def __init__(self, settle_delay=3.0, jitter=4.0, coalesce_window=30.0,
+                 revalidate_interval=15 * 60, retry_interval=60.0, min_interval=20.0,
+                 projected_revalidate_interval=60 * 60):
+        self.settle_delay = settle_delay
+        self.jitter = jitter
+        self.coalesce_window = coalesce_window
+        self.revalidate_interval = revalidate_interval
+        self.retry_interval = retry_interval
+        self.min_interval = min_interval
+        self.projected_revalidate_interval = projected_revalidate_interval
+        self._deadlines = []
+        self._stale = False
+        self._stale_retries = 0
+        self.last_fetch = None
+
+    def plan(self, events, now=None):
+        """Rebuild the queue of upcoming transitions from the events on screen"""
+        if now is None:
+            now = monotonic_now()
+        self._deadlines = [event.deadline for event in events if event.deadline > now]
+        heapq.heapify(self._deadlines)
+        # An event already at zero means the site had not rolled over yet
+        self._stale = any(event.deadline <= now for event in events)
+        if not self._stale:
+            self._stale_retries = 0
+
+    def record_fetch(self, now=None):
+        self.last_fetch = monotonic_now() if now is None else now
+
+    def next_refresh(self, now=None, failed=False, projected=False, retry_after=0.0):
+        """Return (delay_seconds, reason) for the next planned refresh.
+
+        After a failed fetch the retry waits at least ``retry_after`` seconds,
+        the time until some source is out of its backoff.
+        """
+        if now is None:
+            now = monotonic_now()
+
+        interval = self.projected_revalidate_interval if projected else self.revalidate_interval
+        base = now if self.last_fetch is None else self.last_fetch
+        when = max(now, base + interval * random.uniform(0.9, 1.1))
+        reason = "periodic revalidation"
+
+        if self._deadlines:
+            # Fold every transition close to the first one into a single fetch
+            first = heapq.heappop(self._deadlines)
+            last = first
+            while self._deadlines and self._deadlines[0] <= first + self.coalesce_window:
+                last = heapq.heappop(self._deadlines)
+            transition_at = last + self.settle_delay + random.uniform(0, self.jitter)
+            if transition_at < when:
+                when = transition_at
+                reason = "event transition"
+
+        if failed or self._stale:
+            if failed:
+                wait = max(self.retry_interval, retry_after)
+            else:
+                wait = min(self.revalidate_interval, self.retry_interval * 2 ** self._stale_retries)
+            retry_at = now + wait + random.uniform(0, self.jitter)
+            if retry_at < when:
+                when = retry_at
+                if failed:
+                    reason = "retry after failed fetch"
+                else:
+                    reason = "waiting for rollover"
+                    self._stale_retries += 1
+
+        if self.last_fetch is not None:
+            when = max(when, self.last_fetch + self.min_interval)
+
+        return max(0.0, when - now), reason
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+ARC Raiders Event Timer - Schedule Projection
+Learns the event rotation from observed windows and projects it ahead locally
+"""
+
+import json
+import os
+import re
+import threading
+import time
+
+from event_extractor import event_from_record
+from event_model import EventStatus, range_duration
+from snapshot_cache import get_cache_dir
+
+HISTORY_VERSION = 1
+HISTORY_FILE = "rotation-history.json"
+
+DAY = 24 * 3600
+TOLERANCE = 120          # Seconds two observations may differ and still be the same window
+HISTORY_RETENTION = 7 * DAY
+MAX_OBSERVATIONS = 500   # Per event/location
+CONFIRMATIONS_NEEDED = 2
+
+_CLOCK_RANGE = re.compile(r'(\d{1,2}:\d{2}\s*[AP]M)\s*-\s*(\d{1,2}:\d{2}\s*[AP]M)')
+
+
+def _round_minute(epoch):
+    return int(round(epoch / 60.0)) * 60
+
+
+def observed_windows(event, now=None):
+    """Absolute (start, end, location) windows an event tells us about.
+
+    The current window comes from the event's time range and deadline; the
+    upcoming ones are the event's window records. Clock strings are only
+    used for durations, so local-time conversion does not matter.
+    """
+    if now is None:
+        now = time.time()
+    windows = []
+
+    match = _CLOCK_RANGE.search(event.time_info or '')
+    if match:
+        duration = range_duration(match.group(1), match.group(2))
+        remaining = event.remaining()
+        if duration and (remaining > 0 or event.status == EventStatus.ACTIVE):
+            if event.status == EventStatus.ACTIVE:
+                end = _round_minute(now + remaining)
+                start = end - duration
+            else:
+                start = _round_minute(now + remaining)
+                end = start + duration
+            location = event.locations[0] if len(event.locations) == 1 else ""
+            windows.append((start, end, location))
+
+    # Window records are in real time; move them into the frame of ``now`` like the deadline
+    shift = now - time.time()
+    for window in event.windows:
+        if window.start is None or window.end <= window.start:
+            continue
+        start = _round_minute(window.start + shift)
+        windows.append((start, start + int(window.end - window.start), window.location))
+
+    return windows
+
+
+class ScheduleProjection:
+    """Per event/location history of observed windows and the rotation inferred from it.
+
+    Each event/location pair is checked for a fixed repeat interval (the
+    smallest gap between observed starts recurs, and every gap is a multiple
+    of it). Failing
+    that, once at least a day has been observed, the pattern is taken to
+    repeat daily at the observed times of day. Projections are confirmed by
+    comparing them with what the next fetch returns.
+    """
+
+    def __init__(self, convert_range=None, path=None):
+        self.convert_range = convert_range
+        self.path = path or os.path.join(get_cache_dir(), HISTORY_FILE)
+        self.observations = {}  # (event name, location) -> sorted [[start, end], ...]
+        self.confirmed = 0      # Consecutive fetches the projection got right
+        self._lock = threading.Lock()  # observe() runs on the fetch thread
+        self.load()
+
+    # -- history -----------------------------------------------------------
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Could not read rotation history: {e}")
+            return
+        if not isinstance(payload, dict) or payload.get("version") != HISTORY_VERSION:
+            return
+        for entry in payload.get("observations", []):
+            try:
+                key = (entry["event"], entry["location"])
+                self.observations[key] = [[int(s), int(e)] for s, e in entry["windows"]]
+            except (KeyError, TypeError, ValueError):
+                continue
+
+    def save(self):
+        payload = {
+            "version": HISTORY_VERSION,
+            "observations": [
+                {"event": name, "location": location, "windows": windows}
+                for (name, location), windows in self.observations.items()
+            ],
+        }
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Could not save rotation history: {e}")
+
+    def observe(self, events, now=None):
+        """Record every window a freshly fetched event list describes"""
+        if now is None:
+            now = time.time()
+        cutoff = now - HISTORY_RETENTION
+        with self._lock:
+            for event in events:
+                for start, end, location in observed_windows(event, now):
+                    windows = self.observations.setdefault((event.name, location), [])
+                    if not any(abs(start - s) <= TOLERANCE for s, _ in windows):
+                        windows.append([start, end])
+            for key, windows in list(self.observations.items()):
+                windows[:] = sorted(w for w in windows if w[1] >= cutoff)[-MAX_OBSERVATIONS:]
+                if not windows:
+                    del self.observations[key]
+            self.save()
+
+    def event_names(self):
+        """Every event seen in the history, in first-seen order"""
+        with self._lock:
+            names = [name for name, _ in self.observations]
+        return [name for i, name in enumerate(names) if name not in names[:i]]
+
+    # -- inference ---------------------------------------------------------
+
+    def _pattern(self, windows):
+        """Return (period, anchor starts, duration) for one event/location, or None"""
+        starts = [s for s, _ in windows]
+        duration = sorted(e - s for s, e in windows)[len(windows) // 2]
+
+        if len(starts) >= 3:
+            gaps = [b - a for a, b in zip(starts, starts[1:])]
+            period = min(gaps)
+            # The interval itself must have been seen repeating, not just divide
+            # the other gaps: starts at +0/+9/+12 h share a factor of 3 h but say
+            # nothing about a window every 3 h
+            repeats = sum(1 for gap in gaps if abs(gap - period) <= TOLERANCE)
+            if period > TOLERANCE and repeats >= max(2, (len(gaps) + 1) // 2) and all(
+                abs(gap - round(gap / period) * period) <= TOLERANCE for gap in gaps
+            ):
+                return period, [starts[-1]], duration
+
+        if starts[-1] - starts[0] >= DAY - TOLERANCE:
+            # Daily rotation: one anchor per distinct time of day seen in the last day
+            anchors = []
+            for start in reversed(starts):
+                if start < starts[-1] - DAY + TOLERANCE:
+                    break
+                if not any(abs((start - a) % DAY) <= TOLERANCE or abs((a - start) % DAY) <= TOLERANCE
+                           for a in anchors):
+                    anchors.append(start)
+            return DAY, anchors, duration
+
+        return None
+
+    def projected_windows(self, name, now=None, horizon=48 * 3600):
+        """Projected (start, end, location) windows for one event, or None if unknown"""
+        if now is None:
+            now = time.time()
+        with self._lock:
+            history = [(location, list(windows))
+                       for (event_name, location), windows in self.observations.items()
+                       if event_name == name and windows]
+        result = []
+        known = False
+        for location, windows in history:
+            pattern = self._pattern(windows)
+            if pattern is None:
+                continue
+            known = True
+            period, anchors, duration = pattern
+            for anchor in anchors:
+                # First repeat (before or after the anchor) that has not ended yet
+                start = anchor + (int((now - duration - anchor) // period) + 1) * period
+                while start <= now + horizon:
+                    result.append((start, start + duration, location))
+                    start += period
+        if not known:
+            return None
+
+        # Windows without a location are duplicates of a located one if they coincide
+        result.sort(key=lambda w: (w[0], w[2] == ""))
+        merged = []
+        for window in result:
+            if merged and abs(window[0] - merged[-1][0]) <= TOLERANCE:
+                continue
+            merged.append(window)
+        return merged
+
+    def project(self, event_names, now=None, horizon=48 * 3600):
+        """Build EventTimers for the given events from the inferred rotation.
+
+        Returns None unless every event can be projected, so the caller never
+        mixes projected and missing cards.
+        """
+        if now is None:
+            now = time.time()
+        events = []
+        for name in event_names:
+            windows = self.projected_windows(name, now, horizon)
+            if not windows:
+                return None
+            locations = []
+            for _, _, location in windows:
+                if location and location not in locations:
+                    locations.append(location)
+            record = {
+                "name": name,
+                "locations": locations,
+                "windows": [{"start": s, "end": e, "location": loc} for s, e, loc in windows],
+            }
+            event = event_from_record(record, now, self.convert_range)
+            if event is None:
+                return None
+            events.append(event)
+        return events
+
+    def confirm(self, events, now=None):
+        """Compare fetched events with the projection and track the confirmation streak"""
+        if now is None:
+            now = time.time()
+        matched = bool(events)
+        for event in events:
+            observed = observed_windows(event, now)
+            if not observed:
+                continue
+            projected = self.projected_windows(event.name, now - TOLERANCE)
+            if projected is None:
+                matched = False
+                break
+            # Every observed window must have been projected, at the same location...
+            for start, _, location in observed:
+                if not any(abs(start - s) <= TOLERANCE and (not location or location == projected_location)
+                           for s, _, projected_location in projected):
+                    matched = False
+            # ...and nothing may be projected inside the span the site described
+            first = min(start for start, _, _ in observed) - TOLERANCE
+            last = max(start for start, _, _ in observed) + TOLERANCE
+            for start, _, _ in projected:
+                if first <= start <= last and not any(abs(start - s) <= TOLERANCE for s, _, _ in observed):
+                    matched = False
+            if not matched:
+                break
+        self.confirmed = self.confirmed + 1 if matched else 0
+        return matched
+
+    def is_confirmed(self):
+        return self.confirmed >= CONFIRMATIONS_NEEDED
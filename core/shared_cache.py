@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+ARC Raiders Event Timer - Shared Fetch Cache
+Lets every instance on the machine reuse one fetch instead of each going to MetaForge
+"""
+
+import asyncio
+import contextlib
+import os
+
+from snapshot_cache import get_snapshot_path, load_snapshot_entry
+
+LOCK_FILE = "events-snapshot.lock"
+# A snapshot this young (in seconds) is as good as a fetch
+FRESH_FOR = 60.0
+LOCK_POLL_INTERVAL = 0.1
+
+
+class SharedFetchCache:
+    """The event snapshot, used as a fetch cache shared between processes.
+
+    An entry younger than ``fresh_for`` whose events are all still counting
+    down is used instead of the network. Refreshing an expired entry happens
+    under an exclusive flock() on a lock file next to the snapshot, so only
+    one process fetches while the others wait for its result. Without fcntl
+    (non-POSIX systems) nothing is locked and every instance fetches for
+    itself, as before.
+    """
+
+    def __init__(self, path=None, fresh_for=FRESH_FOR):
+        self.path = path or get_snapshot_path()
+        self.lock_path = os.path.join(os.path.dirname(self.path), LOCK_FILE)
+        self.fresh_for = fresh_for
+
+    def fresh(self):
+        """(events, source) of a fresh entry, or None"""
+        events, _, source = load_snapshot_entry(self.path, self.fresh_for)
+        if not events or any(event.remaining() <= 0 for event in events):
+            # Something has rolled over since; the entry no longer describes now
+            return None
+        return events, source
+
+    @contextlib.asynccontextmanager
+    async def refresh_lock(self, timeout):
+        """Hold the refresh lock for the block; yields False if it was not had within timeout"""
+        try:
+            import fcntl
+        except ImportError:
+            yield False
+            return
+        try:
+            os.makedirs(os.path.dirname(self.lock_path), exist_ok=True)
+            lock_file = open(self.lock_path, "a")
+        except OSError as e:
+            print(f"Could not open fetch lock: {e}")
+            yield False
+            return
+
+        with lock_file:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            locked = False
+            # Polled rather than blocking so the fetch loop stays responsive and cancellable
+            while True:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    locked = True
+                    break
+                except BlockingIOError:
+                    pass
+                if loop.time() >= deadline:
+                    break
+                await asyncio.sleep(LOCK_POLL_INTERVAL)
+            try:
+                yield locked
+            finally:
+                if locked:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
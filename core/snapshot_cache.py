@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+ARC Raiders Event Timer - Snapshot Cache
+Keeps the last parsed events on disk so the app can render instantly on startup
+"""
+
+import json
+import os
+import time
+
+from event_model import EventTimer, EventWindow, format_countdown
+
+SNAPSHOT_VERSION = 2
+SNAPSHOT_FILE = "events-snapshot.json"
+
+# Older snapshots describe a rotation that has long since moved on
+MAX_SNAPSHOT_AGE = 12 * 3600
+
+
+def get_cache_dir():
+    """Return the per-user cache directory for the app (XDG_CACHE_HOME aware)"""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "arc-timers")
+
+
+def get_snapshot_path():
+    return os.path.join(get_cache_dir(), SNAPSHOT_FILE)
+
+
+def _window_to_dict(window, shift):
+    return {
+        "start": None if window.start is None else window.start + shift,
+        "end": None if window.end is None else window.end + shift,
+        "location": window.location,
+        "label": window.label,
+    }
+
+
+def _window_from_dict(data, shift):
+    start, end = data.get("start"), data.get("end")
+    return EventWindow(
+        None if start is None else start + shift,
+        None if end is None else end + shift,
+        data.get("location", ""),
+        data["label"],
+    )
+
+
+def event_to_dict(event, now=None):
+    """Serialize an event with its monotonic deadline turned into a wall-clock one"""
+    if now is None:
+        now = time.time()
+    # Window times are real time; a pinned ``now`` moves them along with the deadline
+    shift = now - time.time()
+    return {
+        "name": event.name,
+        "status": event.status,
+        "locations": list(event.locations),
+        "time_info": event.time_info,
+        "deadline": now + event.remaining(),
+        "upcoming_windows": event.upcoming_windows,
+        "windows": [_window_to_dict(window, shift) for window in event.windows],
+    }
+
+
+def events_payload(events, source, now=None):
+    """JSON-ready description of the events; deadlines are Unix timestamps"""
+    if now is None:
+        now = time.time()
+    payload_events = []
+    for event in events:
+        data = event_to_dict(event, now)
+        data["countdown_seconds"] = event.countdown_seconds
+        data["countdown"] = format_countdown(event.countdown_seconds)
+        payload_events.append(data)
+    return {
+        "generated_at": now,
+        "source": source,
+        "events": payload_events,
+    }
+
+
+def event_from_dict(data, now=None):
+    """Rebuild an event, deriving the countdown from the stored deadline"""
+    if now is None:
+        now = time.time()
+    windows = None
+    if "windows" in data:
+        shift = time.time() - now
+        windows = [_window_from_dict(window, shift) for window in data["windows"]]
+    return EventTimer(
+        name=data["name"],
+        status=data["status"],
+        locations=data["locations"],
+        time_info=data["time_info"],
+        countdown_seconds=max(0.0, data["deadline"] - now),
+        upcoming_windows=data["upcoming_windows"],
+        windows=windows,
+    )
+
+
+def save_snapshot(events, path=None, source=None):
+    """Atomically write events (and where they were fetched from) to the snapshot file; returns True on success"""
+    if path is None:
+        path = get_snapshot_path()
+    now = time.time()
+    payload = {
+        "version": SNAPSHOT_VERSION,
+        "saved_at": now,
+        "source": source,
+        "events": [event_to_dict(event, now) for event in events],
+    }
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+        return True
+    except OSError as e:
+        print(f"Could not save event snapshot: {e}")
+        return False
+
+
+def load_snapshot(path=None, max_age=MAX_SNAPSHOT_AGE):
+    """Load events from the snapshot file.
+
+    Returns (events, saved_at), or (None, None) when there is no usable
+    snapshot (missing, unreadable, wrong version or too old).
+    """
+    events, saved_at, _ = load_snapshot_entry(path, max_age)
+    return events, saved_at
+
+
+def load_snapshot_entry(path=None, max_age=MAX_SNAPSHOT_AGE):
+    """Like load_snapshot, returning (events, saved_at, source) or (None, None, None)"""
+    if path is None:
+        path = get_snapshot_path()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+    except FileNotFoundError:
+        return None, None, None
+    except (OSError, ValueError) as e:
+        print(f"Could not read event snapshot: {e}")
+        return None, None, None
+
+    if not isinstance(payload, dict) or payload.get("version") != SNAPSHOT_VERSION:
+        return None, None, None
+
+    now = time.time()
+    saved_at = payload.get("saved_at", 0)
+    if now - saved_at > max_age:
+        return None, None, None
+
+    try:
+        events = [event_from_dict(data, now) for data in payload.get("events", [])]
+    except (KeyError, TypeError, ValueError) as e:
+        print(f"Ignoring malformed event snapshot: {e}")
+        return None, None, None
+    if not events:
+        return None, None, None
+    return events, saved_at, payload.get("source")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+ARC Raiders Event Timer - Source Health
+Backs off from failing event sources instead of hitting them on every refresh
+"""
+
+import random
+import threading
+import time
+
+# First retry delay after a failure (seconds); doubles with every further one
+BASE_BACKOFF = 30.0
+MAX_BACKOFF = 30 * 60.0
+# +/- this fraction of randomness so instances don't retry in lockstep
+BACKOFF_JITTER = 0.2
+# Consecutive failures after which a source is considered down...
+BREAKER_THRESHOLD = 3
+# ...and not probed again for at least this long
+BREAKER_COOLDOWN = 10 * 60.0
+# Longest Retry-After honoured; anything beyond is treated as a mistake
+MAX_RETRY_AFTER = 60 * 60.0
+
+
+class SourceHealth:
+    """Failure history of one event source, with backoff and a circuit breaker.
+
+    Every failure blocks the source for an exponentially growing, jittered
+    delay, or for as long as the server asked with Retry-After if that is
+    longer. After BREAKER_THRESHOLD failures in a row the circuit opens and
+    the source is left alone for at least BREAKER_COOLDOWN; once that has
+    passed it is tried again, and a single success closes the circuit.
+    Times are on the time.monotonic() clock.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.failures = 0
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def circuit_open(self):
+        return self.failures >= BREAKER_THRESHOLD
+
+    def available(self, now=None):
+        """True if the source may be tried now"""
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            return now >= self.blocked_until
+
+    def wait_time(self, now=None):
+        """Seconds until the source may be tried again (0 if it may be now)"""
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            return max(0.0, self.blocked_until - now)
+
+    def record_success(self):
+        with self._lock:
+            if self.circuit_open:
+                print(f"Source {self.name} is back")
+            self.failures = 0
+            self.blocked_until = 0.0
+
+    def record_failure(self, retry_after=None, now=None, breaker=True):
+        """Block the source after a failure; retry_after is the server's Retry-After in seconds.
+
+        Without breaker the circuit cooldown is not applied, only the backoff.
+        """
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            self.failures += 1
+            delay = min(MAX_BACKOFF, BASE_BACKOFF * 2 ** (self.failures - 1))
+            delay *= random.uniform(1 - BACKOFF_JITTER, 1 + BACKOFF_JITTER)
+            if breaker and self.circuit_open:
+                delay = max(delay, BREAKER_COOLDOWN)
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, MAX_RETRY_AFTER))
+            self.blocked_until = now + delay
+            if breaker and self.failures == BREAKER_THRESHOLD:
+                print(f"Source {self.name} failed {self.failures} times in a row; leaving it alone for a while")
+        return delay
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+ARC Raiders Event Timer - Time Conversion
+Memoized conversion of MetaForge's UTC wall-clock times to the local timezone
+"""
+
+import calendar
+import time
+from datetime import datetime, timedelta, timezone
+
+# How often the UTC date and local offset are re-read to catch DST changes
+RECHECK_INTERVAL = 60.0
+# Bound on remembered strings; the site only ever shows a few dozen
+MAX_CACHED = 1024
+
+
+class LocalTimeConverter:
+    """Convert 'H:MM AM' times and 'H:MM AM - H:MM PM' ranges from UTC to local time.
+
+    The site only uses a handful of distinct wall-clock times, so results are
+    memoized per (UTC date, local UTC offset). The cache is dropped when the
+    UTC date rolls over at midnight or the local offset changes (a DST
+    transition or a changed system timezone). Times are anchored on the
+    current UTC date; the end of a range that wraps past midnight is anchored
+    on the following day.
+
+    Instances are callable with one range, so they can be passed anywhere a
+    ``convert_range`` function is expected; ``batch`` converts several ranges
+    against the same date and offset.
+    """
+
+    def __init__(self, local_tz=None, clock=time.time):
+        self.local_tz = local_tz  # None: the system's rules, per converted instant
+        self._clock = clock
+        self._times = {}   # (time string, days after today) -> local time string
+        self._ranges = {}  # range string -> local range string
+        self._generation = None  # (UTC date, local offset) the caches belong to
+        self._recheck_at = 0.0
+
+    def _check_generation(self):
+        now = self._clock()
+        if now < self._recheck_at:
+            return
+        utc_now = datetime.fromtimestamp(now, timezone.utc)
+        generation = (utc_now.date(), utc_now.astimezone(self.local_tz).utcoffset())
+        if generation != self._generation:
+            self._times.clear()
+            self._ranges.clear()
+            self._generation = generation
+        next_midnight = calendar.timegm((utc_now.date() + timedelta(days=1)).timetuple())
+        self._recheck_at = min(next_midnight, now + RECHECK_INTERVAL)
+
+    def _convert_time(self, time_str, days=0):
+        key = (time_str, days)
+        local = self._times.get(key)
+        if local is None:
+            utc_time = datetime.strptime(time_str.strip(), "%I:%M %p")
+            date = self._generation[0] + timedelta(days=days)
+            utc_datetime = datetime(date.year, date.month, date.day,
+                                    utc_time.hour, utc_time.minute, tzinfo=timezone.utc)
+            local = utc_datetime.astimezone(self.local_tz).strftime("%I:%M %p")
+            if len(self._times) >= MAX_CACHED:
+                self._times.clear()
+            self._times[key] = local
+        return local
+
+    def convert_time(self, time_str):
+        """Convert a UTC time string like '5:00 AM' to local time"""
+        self._check_generation()
+        try:
+            return self._convert_time(time_str)
+        except Exception as e:
+            print(f"Error converting time {time_str}: {e}")
+            return time_str
+
+    def _convert_range(self, time_range):
+        local = self._ranges.get(time_range)
+        if local is not None:
+            return local
+
+        local = time_range
+        if time_range and '-' in time_range:
+            parts = time_range.split('-')
+            if len(parts) == 2:
+                start, end = parts
+                try:
+                    start_time = datetime.strptime(start.strip(), "%I:%M %p").time()
+                    end_time = datetime.strptime(end.strip(), "%I:%M %p").time()
+                    # A range like '11:00 PM - 1:00 AM' ends on the next UTC day
+                    end_days = 1 if end_time < start_time else 0
+                    local = f"{self._convert_time(start)} - {self._convert_time(end, end_days)}"
+                except Exception as e:
+                    print(f"Error converting time range {time_range}: {e}")
+
+        if len(self._ranges) >= MAX_CACHED:
+            self._ranges.clear()
+        self._ranges[time_range] = local
+        return local
+
+    def __call__(self, time_range):
+        """Convert a UTC range like '5:00 AM - 6:00 AM' to local time"""
+        self._check_generation()
+        return self._convert_range(time_range)
+
+    def batch(self, time_ranges):
+        """Convert several ranges (e.g. all of a card's windows) in one pass"""
+        self._check_generation()
+        return [self._convert_range(time_range) for time_range in time_ranges]
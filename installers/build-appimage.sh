@@ -25,7 +25,8 @@ mkdir -p "$BUILD_DIR"
 
 # Copy application files to build directory
 echo "Copying application files..."
-cp "$PROJECT_ROOT/core/arc_timers.py" "$BUILD_DIR/"
+# arc_timers.py imports its sibling modules, so bundle the whole core directory
+cp "$PROJECT_ROOT"/core/*.py "$BUILD_DIR/"
 cp "$PROJECT_ROOT/requirements.txt" "$BUILD_DIR/"
 cp "$PROJECT_ROOT/timers250.png" "$BUILD_DIR/"
 
@@ -0,0 +1,22 @@
+#!/bin/bash
+# Headless launcher for ARC Raiders Event Timers (JSON output, no display needed)
+# Arguments are passed through, e.g. --daemon --output events.json
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PROJECT_ROOT="$(dirname "$SCRIPT_DIR")"
+
+cd "$PROJECT_ROOT"
+
+# The headless mode only needs the network and parsing stack
+if ! python3 -c "import requests, lxml" 2>/dev/null; then
+    echo "Error: Dependencies not installed!" >&2
+    echo "Please run the installer first:" >&2
+    echo "  ./launch-installer.sh" >&2
+    exit 1
+fi
+
+if [ -d "venv" ]; then
+    source venv/bin/activate
+fi
+
+exec python3 core/arc_timers_cli.py "$@"